@@ -0,0 +1,291 @@
+"""
+Alert rules for every portfolio, evaluated together after each data refresh.
+
+Rules live in each portfolios/<key>.toml as [[alerts]] tables:
+
+    [[alerts]]
+    name = "Top 10 falls below SPY"
+    when = "excess < 0"
+    cohort = "Top 10"
+
+They are compiled into index arrays over one metrics matrix, so any number
+of rules across all trackers costs a single pass over the price matrix.
+New alerts are appended as JSON lines to ALERT_LOG and, if set, POSTed to
+TRACKER_ALERT_WEBHOOK. Run once from cron with `python alerts.py`.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import requests
+
+from leaderboard import basket_values, cohort_rows, universe
+from portfolio_config import ALERT_METRICS
+from rolling_stats import STATE_DIR
+from trading_calendar import session_range
+
+# === CONFIGURATION ===
+ALERT_LOG = os.environ.get("TRACKER_ALERT_LOG", os.path.join(STATE_DIR, "alerts.log"))
+ALERT_STATE = os.path.join(STATE_DIR, "alerts_state.json")
+ALERT_WEBHOOK = os.environ.get("TRACKER_ALERT_WEBHOOK", "")
+ALERT_INTERVAL = int(os.environ.get("ALERT_INTERVAL", 900))   # seconds between checks; 0 disables the job
+OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+logger = logging.getLogger(__name__)
+
+
+# === Compile ===
+def compile_rules(portfolios):
+    """
+    Expand every rule to the cohort rows it watches.
+
+    Returns (rules, pairs): the (portfolio, rule) list and a dict of arrays,
+    one entry per (rule, row) pair: rule id, row, metric, op and threshold.
+    Pairs of one rule are contiguous, so per-rule results reduce with reduceat.
+    """
+    labels = [(p.key, label) for p in portfolios for label in p.cohort_map]
+    row_of = {key: r for r, key in enumerate(labels)}
+
+    rules, pairs = [], []
+    for p in portfolios:
+        for rule in p.alerts:
+            targets = list(p.cohort_map) if rule.cohort == "*" else [rule.cohort]
+            for label in targets:
+                pairs.append((len(rules), row_of[(p.key, label)], ALERT_METRICS.index(rule.metric),
+                              list(OPS).index(rule.op), rule.threshold))
+            rules.append((p, rule))
+
+    cols = list(zip(*pairs)) if pairs else [[]] * 5
+    dtypes = (int, int, int, int, float)
+    names = ("rule", "row", "metric", "op", "threshold")
+    return rules, {name: np.asarray(col, dtype=dt) for name, col, dt in zip(names, cols, dtypes)}
+
+
+def _compare(values, ops, thresholds):
+    """Apply each pair's op and threshold to its entry (or row) of `values`, one vectorized compare per op."""
+    fired = np.zeros(values.shape, dtype=bool)
+    for i, op in enumerate(OPS.values()):
+        sel = ops == i
+        if sel.any():
+            fired[sel] = op(values[sel], thresholds[sel].reshape(-1, *[1] * (values.ndim - 1)))
+    return fired
+
+
+# === Evaluate ===
+def evaluate_alerts(prices, portfolios):
+    """Every rule currently firing, as alert dicts with a stable `key` per cohort or holding."""
+    rows = cohort_rows(portfolios)
+    rules, pairs = compile_rules(portfolios)
+    if not rules or prices.empty:
+        return []
+    k = len(rows)
+    labels = [label for p in portfolios for label in p.cohort_map]   # same order as cohort_rows
+    values, members, base, px = basket_values(prices, rows)
+
+    # cohort metrics (k x 3): return, excess, drawdown from the running peak
+    last = values[-1]
+    ret = (last[:k] - 1) * 100
+    excess = ret - (last[k:] - 1) * 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        peak = np.fmax.reduce(values[:, :k], axis=0)
+        drawdown = (1 - last[:k] / peak) * 100
+        holdings = np.where(members[:k] > 0, (px[-1] / base[:k] - 1) * 100, np.nan)   # (k x n)
+    cohort_metrics = np.column_stack([ret, excess, drawdown])
+
+    alerts = []
+    is_holding = pairs["metric"] == ALERT_METRICS.index("holding_return")
+
+    # cohort-level pairs: one gather and one compare
+    c = ~is_holding
+    c_values = cohort_metrics[pairs["row"][c], pairs["metric"][c]]
+    c_fired = _compare(c_values, pairs["op"][c], pairs["threshold"][c])
+    for rule_id, row, value in zip(pairs["rule"][c][c_fired], pairs["row"][c][c_fired], c_values[c_fired]):
+        p, rule = rules[rule_id]
+        alerts.append({
+            "key": f"{p.key}|{rule.title}|{labels[row]}",
+            "portfolio": p.key, "cohort": labels[row], "rule": rule.title, "when": rule.when,
+            "value": round(float(value), 4),
+        })
+
+    # holding-level pairs: compare each watched row's holdings, then OR the rows of each rule
+    h = np.flatnonzero(is_holding)
+    if len(h):
+        h_values = holdings[pairs["row"][h]]
+        h_fired = _compare(h_values, pairs["op"][h], pairs["threshold"][h])
+        rule_ids = pairs["rule"][h]
+        first = np.flatnonzero(np.r_[True, rule_ids[1:] != rule_ids[:-1]])
+        any_fired = np.logical_or.reduceat(h_fired, first, axis=0)
+        # a symbol's return is the same in every cohort of one portfolio, so any fired row's value will do
+        hit_values = np.fmax.reduceat(np.where(h_fired, h_values, np.nan), first, axis=0)
+        row_fired = h_fired.any(axis=1)
+        for i, (rule_id, hit, vals) in enumerate(zip(rule_ids[first], any_fired, hit_values)):
+            if not hit.any():
+                continue
+            p, rule = rules[rule_id]
+            pair_rows = slice(first[i], first[i + 1] if i + 1 < len(first) else None)
+            cohorts = [labels[row] for row in pairs["row"][h][pair_rows][row_fired[pair_rows]]]
+            symbols = {prices.columns[j]: round(float(vals[j]), 4) for j in np.flatnonzero(hit)}
+            alerts.append({
+                "key": f"{p.key}|{rule.title}",
+                "portfolio": p.key, "cohort": ", ".join(cohorts), "rule": rule.title, "when": rule.when,
+                "symbols": symbols,
+            })
+    return alerts
+
+
+# === Sink ===
+_run_lock = threading.Lock()   # the page and the background job may finish a refresh together
+
+
+def _load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Webhook POSTs leave from their own thread: a slow endpoint never holds up a page render or _run_lock
+_outbox = queue.Queue()
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def _send_loop():
+    while True:
+        alerts, webhook = _outbox.get()
+        try:
+            requests.post(webhook, json={"alerts": alerts}, timeout=10).raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("alert webhook failed: %s", e)
+        finally:
+            _outbox.task_done()
+
+
+def _queue_webhook(alerts, webhook):
+    global _sender
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = threading.Thread(target=_send_loop, name="tracker-alert-webhook", daemon=True)
+            _sender.start()
+    _outbox.put((alerts, webhook))
+
+
+def flush_webhooks():
+    """Wait until every queued webhook POST has been sent (or failed); for short-lived processes."""
+    _outbox.join()
+
+
+def emit(alerts, log_path=ALERT_LOG, webhook=ALERT_WEBHOOK):
+    """Append alerts as JSON lines and queue them for the webhook, if any."""
+    if not alerts:
+        return
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    with open(log_path, "a") as f:
+        for alert in alerts:
+            f.write(json.dumps(alert) + "\n")
+    if webhook:
+        _queue_webhook(alerts, webhook)
+
+
+def run_alerts(dataset, portfolios, state_path=ALERT_STATE, log_path=ALERT_LOG, webhook=ALERT_WEBHOOK):
+    """
+    Evaluate all rules once per data version and emit only what newly fired:
+    a condition that stays true across refreshes alerts once, and again only
+    after it has cleared. Holding rules track each symbol separately.
+    """
+    with _run_lock:
+        return _run_alerts(dataset, portfolios, state_path, log_path, webhook)
+
+
+def _run_alerts(dataset, portfolios, state_path, log_path, webhook):
+    state = _load_state(state_path)
+    # Nothing loaded yet (all pending on quota) is not "nothing firing": keep the last state
+    if dataset.prices.empty or state.get("version") == dataset.version:
+        return []
+    was_firing = set(state.get("firing", []))
+    stamp = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "session": dataset.to_date}
+
+    firing, new = set(), []
+    for alert in evaluate_alerts(dataset.prices, portfolios):
+        if "symbols" in alert:
+            keys = {sym: f"{alert['key']}|{sym}" for sym in alert["symbols"]}
+            firing.update(keys.values())
+            fresh = {sym: v for sym, v in alert["symbols"].items() if keys[sym] not in was_firing}
+            if fresh:
+                new.append({**stamp, **alert, "symbols": fresh})
+        else:
+            firing.add(alert["key"])
+            if alert["key"] not in was_firing:
+                new.append({**stamp, **alert})
+
+    emit(new, log_path, webhook)
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    with open(f"{state_path}.tmp", "w") as f:
+        json.dump({"version": dataset.version, "firing": sorted(firing)}, f)
+    os.replace(f"{state_path}.tmp", state_path)
+    return new
+
+
+def recent_alerts(n=20, log_path=ALERT_LOG):
+    """The last `n` emitted alerts, newest first."""
+    try:
+        with open(log_path) as f:
+            lines = f.readlines()[-n:]
+    except OSError:
+        return []
+    return [json.loads(line) for line in reversed(lines) if line.strip()]
+
+
+# === Background job ===
+def load_universe(portfolios, load):
+    """The leaderboard's dataset: every symbol of every portfolio over the widest window."""
+    symbols, start, end = universe(portfolios)
+    return load(tuple(symbols), portfolios[0].benchmark, *session_range(start, end))
+
+
+def alert_job(portfolios, load, interval=ALERT_INTERVAL):
+    """Check for refreshed data every `interval` seconds; only a new data version produces alerts."""
+    while True:
+        try:
+            run_alerts(load_universe(portfolios, load), portfolios)
+        except Exception:
+            logger.exception("alert run failed")
+        time.sleep(interval)
+
+
+_job = None
+_job_lock = threading.Lock()
+
+
+def start_alert_job(portfolios, load, interval=ALERT_INTERVAL):
+    """Start the process-wide alert thread once; a no-op when ALERT_INTERVAL is 0."""
+    global _job
+    if interval <= 0 or not any(p.alerts for p in portfolios):
+        return None
+    with _job_lock:
+        if _job is None or not _job.is_alive():
+            _job = threading.Thread(target=alert_job, args=(tuple(portfolios), load, interval),
+                                    name="tracker-alerts", daemon=True)
+            _job.start()
+    return _job
+
+
+if __name__ == "__main__":
+    from functools import partial
+
+    from portfolio_config import load_portfolios
+    from tracker_data import build_dataset, restore_price_snapshot
+
+    logging.basicConfig(level=logging.INFO)
+    restore_price_snapshot()    # like app.py: only sessions past the snapshot are fetched
+    portfolios = load_portfolios()
+    load = partial(build_dataset, api_key=os.environ["FMP_API_KEY"])
+    for alert in run_alerts(load_universe(portfolios, load), portfolios):
+        print(json.dumps(alert))
+    flush_webhooks()
@@ -0,0 +1,52 @@
+import startup  # first, so its clock starts at boot
+
+import streamlit as st
+
+from alerts import start_alert_job
+from fetch_quota import DAILY_BUDGET, calls_used
+from live_quotes import LIVE_INTERVAL
+from portfolio_config import load_portfolios
+from tracker_data import load_dataset, restore_price_snapshot
+from views import render_leaderboard, render_portfolio
+
+startup.mark("imports")
+
+# One process serves every portfolio in portfolios/*.toml, sharing the price
+# store and caches; adding a portfolio is a new config file
+st.set_page_config(page_title="Portfolio Trackers", layout="wide")
+
+
+def portfolio_page(p):
+    def page():
+        render_portfolio(p)
+    page.__name__ = p.key
+    return st.Page(page, title=p.page_title, icon=p.icon, url_path=p.key)
+
+
+@st.cache_resource(show_spinner=False)
+def restore_prices():
+    """Once per process: refill the price store from the last snapshot, so a restart refetches nothing."""
+    restored = restore_price_snapshot()
+    startup.mark("price snapshot restored", symbols=restored)
+    return restored
+
+
+restore_prices()
+portfolios = load_portfolios()
+start_alert_job(portfolios, load_dataset)   # once per process; re-checks rules as new sessions land
+
+# Sidebar widgets outlive page switches, so live mode follows the user around
+with st.sidebar:
+    live = st.toggle("⚡ Live quotes", key="live_quotes")
+    st.number_input("Refresh every (s)", min_value=5, value=LIVE_INTERVAL, step=5, key="live_interval", disabled=not live)
+
+def leaderboard():
+    render_leaderboard(portfolios)
+
+page = st.navigation(
+    [st.Page(leaderboard, title="Leaderboard", icon="🏆", url_path="leaderboard", default=True)]
+    + [portfolio_page(p) for p in portfolios]
+)
+page.run()
+st.sidebar.caption(f"FMP calls today: {calls_used()}" + (f" / {DAILY_BUDGET}" if DAILY_BUDGET > 0 else ""))
+startup.report(page=page.url_path or "leaderboard")
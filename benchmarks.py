@@ -0,0 +1,389 @@
+"""
+Microbenchmarks for the returns kernels on synthetic universes.
+
+Each kernel pairs the logic the pages run today (the reference) with
+vectorized candidates. Every run checks that the candidates reproduce the
+reference's numbers, times both and measures peak memory, appends the
+results of passing runs to BENCH_HISTORY (JSON lines) and exits non-zero if
+a candidate disagrees or a case got slower / hungrier than its recorded baseline.
+Times are gated as ratios to something timed in the same rounds (candidates
+to the reference, the reference to a fixed yardstick), so host load cancels
+out; after an intended change, --accept records the run as the new baseline.
+
+    python benchmarks.py                  # quick grid: 100-1,000 symbols, 1 month-1 year
+    python benchmarks.py --grid full      # 100-5,000 symbols, 1 month-10 years
+    python benchmarks.py --kernel port_df --no-record
+    python benchmarks.py --accept         # a slowdown is intended: start a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from portfolio_config import Cohort, Portfolio
+from render_cache import data_version
+from tracker_data import TrackerDataset
+from tracker_stats import price_matrix, total_returns
+from views import calculate_returns, cohort_returns, ranked_frame, value_frame
+
+# === CONFIGURATION ===
+BENCH_HISTORY = os.environ.get("BENCH_HISTORY", "bench_history.jsonl")
+GRIDS = {
+    "quick": {"symbols": (100, 1000), "days": (21, 252)},
+    "full": {"symbols": (100, 500, 1000, 5000), "days": (21, 252, 2520)},
+}
+TIME_TOLERANCE = 1.0      # fail when the time ratio more than doubles its baseline (host drift alone moves it ~70%)...
+TIME_FLOOR = 0.005        # ...and that costs more than this many seconds
+ROUND_TIME = 0.02         # each implementation runs back to back for at least this long per round
+MIN_ROUNDS = 3
+MEMORY_TOLERANCE = 0.10   # fail when peak memory grows by more than this fraction...
+MEMORY_FLOOR = 1.0        # ...and by more than this many MB
+BASELINE_RUNS = 5         # baseline = median of the last N matching records since the last --accept
+RTOL = 1e-9               # candidates may sum in a different order, nothing more
+
+
+# === Synthetic universe ===
+def synthetic_universe(n_symbols, n_days, seed=0):
+    """
+    A ranked portfolio over `n_symbols` random-walk closes plus SPY.
+
+    About 5% of symbols list part-way through, so the kernels see the same
+    ragged starts the FMP data has.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-06-30", periods=n_days)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    closes = 50 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, (n_days, n_symbols + 1)), axis=0))
+    late = rng.choice(n_symbols, size=n_symbols // 20, replace=False)
+    starts = rng.integers(1, max(n_days // 2, 2), size=len(late))
+    price_data = {}
+    for j, sym in enumerate([*symbols, "SPY"]):
+        s = pd.Series(closes[:, j], index=dates)
+        price_data[sym] = s
+    for j, start in zip(late, starts):
+        price_data[symbols[j]] = price_data[symbols[j]].iloc[start:]
+
+    prices = price_matrix(price_data)
+    dataset = TrackerDataset(
+        symbols=tuple(symbols), benchmark="SPY",
+        from_date=str(dates[0].date()), to_date=str(dates[-1].date()),
+        prices=prices, failed=(), version=data_version(prices),
+    )
+    p = Portfolio(
+        key=f"bench_{n_symbols}", title="", page_title="", layout="ranked",
+        purchase_date=str(dates[0].date()),
+        tickers=tuple(rng.permutation(symbols)),
+        cohorts=(Cohort("Top 10", 10), Cohort("Top 30", 30), Cohort(f"Top {n_symbols}")),
+    )
+    return dataset, p
+
+
+# === Kernels ===
+# Each kernel is (reference, {name: candidate}, check): every function takes
+# (dataset, p), and check(reference_out, candidate_out) raises on a mismatch
+
+def _stock_frames(dataset, p):
+    return {sym: dataset.series(sym).to_frame("close") for sym in [p.benchmark, *p.tickers] if sym in dataset.prices}
+
+
+def reference_symbol_returns(dataset, p):
+    """The value pages' per-symbol loop: a frame per symbol, then calculate_returns."""
+    rtns, portfolio_value = calculate_returns(_stock_frames(dataset, p), p.investment, p.benchmark)
+    pct = pd.Series({sym: r["return_pct"] for sym, r in rtns.items()})
+    final = pd.Series({sym: r["final_value"] for sym, r in rtns.items()})
+    return pct, final, portfolio_value
+
+
+def matrix_symbol_returns(dataset, p):
+    prices = dataset.prices[[s for s in [p.benchmark, *p.tickers] if s in dataset.prices]]
+    pct = total_returns(prices)
+    final = p.investment * (1 + pct / 100)
+    return pct, final, final.drop(p.benchmark, errors="ignore").sum()
+
+
+def check_symbol_returns(ref, cand):
+    pd.testing.assert_series_equal(ref[0], cand[0], rtol=RTOL, check_names=False)
+    pd.testing.assert_series_equal(ref[1], cand[1], rtol=RTOL, check_names=False)
+    np.testing.assert_allclose(ref[2], cand[2], rtol=RTOL)
+
+
+def reference_portfolio_return(dataset, p):
+    return pd.Series(cohort_returns(dataset, p), dtype=float)
+
+
+def matrix_portfolio_return(dataset, p):
+    """Cohort means as one membership-matrix product over the returns vector."""
+    returns = dataset.returns.drop(p.benchmark, errors="ignore")
+    cohorts = p.cohort_map
+    members = np.zeros((len(cohorts), len(returns)))
+    for r, symbols in enumerate(cohorts.values()):
+        idx = returns.index.get_indexer(symbols)
+        members[r, idx[idx >= 0]] = 1
+    with np.errstate(invalid="ignore"):
+        means = members @ returns.to_numpy() / members.sum(axis=1)
+    return pd.Series(means, index=list(cohorts))
+
+
+def check_series(ref, cand):
+    pd.testing.assert_series_equal(ref, cand, rtol=RTOL, check_names=False)
+
+
+def reference_port_df(dataset, p):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)   # the column-by-column inserts
+        return value_frame(_stock_frames(dataset, p), p)
+
+
+def matrix_port_df(dataset, p):
+    """
+    port_df in one broadcast. The reference's first inserted column fixes
+    the index, so later listings are NaN before their start and dates before
+    the first holding's start are dropped; reproduce exactly that.
+    """
+    held = [s for s in p.tickers if s in dataset.prices]
+    index = dataset.series(held[0]).index if held else pd.DatetimeIndex([])
+    closes = dataset.prices.loc[index, held]      # NaN before each listing, as price_matrix leaves them
+    shares = p.investment / dataset.prices[held].bfill().iloc[0]
+    port_df = closes * shares
+    port_df["Portfolio"] = port_df.sum(axis=1)
+    bench = dataset.series(p.benchmark)
+    if not bench.empty:
+        port_df[p.benchmark] = bench * (p.investment * len(p.tickers) / bench.iloc[0])
+    port_df.index.name = "Date"
+    port_df.columns.name = None
+    return port_df
+
+
+def check_frame(ref, cand):
+    pd.testing.assert_frame_equal(ref, cand, rtol=RTOL, check_freq=False)
+
+
+def reference_rank_labels(dataset, p):
+    return ranked_frame(dataset.returns, p)
+
+
+def lookup_rank_labels(dataset, p):
+    """Rank and smallest-cohort label from dict lookups instead of list scans."""
+    returns = dataset.returns.drop(p.benchmark, errors="ignore")
+    df = returns.to_frame("Return (%)")
+    df.index.name = "Symbol"
+    df = df.reset_index()
+
+    cohorts = p.cohort_map
+    label_of = {}
+    for label, symbols in reversed(cohorts.items()):   # smaller cohorts overwrite larger ones
+        label_of.update(dict.fromkeys(symbols, label))
+    df["Portfolio"] = df["Symbol"].map(label_of).fillna(list(cohorts)[-1])
+
+    rank = {}
+    for i, s in enumerate(p.tickers):
+        rank.setdefault(s, i + 1)
+    df["Prediction Rank"] = df["Symbol"].map(rank)
+    return df[["Prediction Rank", "Symbol", "Return (%)", "Portfolio"]]
+
+
+KERNELS = {
+    "symbol_returns": (reference_symbol_returns, {"matrix": matrix_symbol_returns}, check_symbol_returns),
+    "portfolio_return": (reference_portfolio_return, {"matrix": matrix_portfolio_return}, check_series),
+    "port_df": (reference_port_df, {"matrix": matrix_port_df}, check_frame),
+    "rank_labels": (reference_rank_labels, {"lookup": lookup_rank_labels}, check_frame),
+}
+
+
+# === Measurement ===
+_YARD = pd.DataFrame(np.random.default_rng(0).random((252, 500)) + 1)
+
+
+def yardstick(dataset, p):
+    """Fixed numpy/pandas work, timed alongside the reference to read the host's current speed."""
+    return (_YARD.pct_change().cumsum().iloc[-1] / _YARD.std()).sort_values()
+
+
+def _timed(fn, args):
+    # CPU time of this process: other processes sharing the CPUs don't count against the kernel
+    t = time.process_time()
+    out = fn(*args)
+    return time.process_time() - t, out
+
+
+def measure(fns, args, min_time=0.5, max_rounds=50):
+    """
+    {impl: (best CPU seconds, peak MB, output)}. After a warm-up call, the
+    implementations take turns for at least MIN_ROUNDS rounds of ROUND_TIME
+    each, so a burst of host load slows them alike and a fast candidate gets
+    as many samples as a slow reference; then one traced run each for memory.
+    """
+    outs, reps, times = {}, {}, {impl: [] for impl in fns}
+    for impl, fn in fns.items():
+        first, outs[impl] = _timed(fn, args)
+        reps[impl] = max(1, int(ROUND_TIME / max(first, 1e-9)))
+    for rounds in range(max_rounds):
+        if rounds >= MIN_ROUNDS and sum(map(sum, times.values())) >= min_time * len(fns):
+            break
+        for impl, fn in fns.items():
+            times[impl] += [_timed(fn, args)[0] for _ in range(reps[impl])]
+    result = {}
+    for impl, fn in fns.items():
+        tracemalloc.start()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[impl] = (min(times[impl]), peak / 2**20, outs[impl])
+    return result
+
+
+def host():
+    """Fingerprint of the machine, so baselines only compare like with like."""
+    return f"{platform.node()}|{platform.machine()}|{platform.python_version()}|np{np.__version__}|pd{pd.__version__}"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def load_history(path=BENCH_HISTORY):
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def baseline(history, record):
+    """
+    Median time ratio and peak MB of the last BASELINE_RUNS records for the
+    same case on this host, counting only the runs since it was last accepted.
+    """
+    same = [
+        h for h in history
+        if all(h.get(k) == record[k] for k in ("host", "kernel", "impl", "symbols", "days"))
+    ]
+    accepted = [i for i, h in enumerate(same) if h.get("accepted")]
+    same = same[accepted[-1] if accepted else 0:][-BASELINE_RUNS:]
+    if not same:
+        return None
+    ratios = [h["ratio"] for h in same if "ratio" in h]
+    return statistics.median(ratios) if ratios else None, statistics.median(h["peak_mb"] for h in same)
+
+
+def regressions(record, base, time_tol=TIME_TOLERANCE, mem_tol=MEMORY_TOLERANCE):
+    if base is None:
+        return []
+    ratio, peak_mb = base
+    found = []
+    # Ratios to what ran alongside in the same rounds: a loaded host slows both alike
+    if ratio is not None:
+        excess = record["seconds"] * (1 - ratio / record["ratio"])   # time lost at today's host speed
+        if record["ratio"] > ratio * (1 + time_tol) and excess > TIME_FLOOR:
+            against = "yardstick" if record["impl"] == "reference" else "reference"
+            found.append(f"time {record['ratio']:.3g}x {against} vs {ratio:.3g}x")
+    if record["peak_mb"] > peak_mb * (1 + mem_tol) and record["peak_mb"] - peak_mb > MEMORY_FLOOR:
+        found.append(f"memory {record['peak_mb']:.1f}MB vs {peak_mb:.1f}MB")
+    return found
+
+
+# === Runner ===
+def _case_records(timed, fns, history, stamp, kernel, n_symbols, n_days, time_tol, mem_tol):
+    """{impl: (record, peak MB, output, regressions)} for one measured case."""
+    cases = {}
+    for impl in fns:
+        seconds, peak, out = timed[impl]
+        against = timed["yardstick" if impl == "reference" else "reference"][0]
+        rec = {**stamp, "kernel": kernel, "impl": impl, "symbols": n_symbols, "days": n_days,
+               "seconds": seconds, "ratio": round(seconds / against, 5), "peak_mb": round(peak, 3)}
+        cases[impl] = (rec, peak, out, regressions(rec, baseline(history, rec), time_tol, mem_tol))
+    return cases
+
+
+def run(grid, kernels, record=True, time_tol=TIME_TOLERANCE, mem_tol=MEMORY_TOLERANCE, history_path=BENCH_HISTORY,
+        accept=False):
+    history = load_history(history_path)
+    stamp = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": git_commit(), "host": host()}
+    records, failures = [], []
+
+    print(f"{'kernel':<17}{'impl':<11}{'symbols':>8}{'days':>6}{'ms':>11}{'x ref':>8}{'peak MB':>9}  status")
+    for n_symbols in grid["symbols"]:
+        for n_days in grid["days"]:
+            dataset, p = synthetic_universe(n_symbols, n_days)
+            dataset.returns   # cached on the dataset, as on the pages
+            for name in kernels:
+                reference, candidates, check = KERNELS[name]
+                fns = {"reference": reference, **candidates}
+                cases = _case_records(measure({**fns, "yardstick": yardstick}, (dataset, p)), fns, history,
+                                      stamp, name, n_symbols, n_days, time_tol, mem_tol)
+                if not accept and any(slower for _, _, _, slower in cases.values()):
+                    # Confirm on a second measurement before failing: one noisy pass isn't a regression
+                    again = _case_records(measure({**fns, "yardstick": yardstick}, (dataset, p)), fns, history,
+                                          stamp, name, n_symbols, n_days, time_tol, mem_tol)
+                    cases = {impl: min(cases[impl], again[impl], key=lambda c: (len(c[3]), c[0]["ratio"]))
+                             for impl in cases}
+                ref_seconds = cases["reference"][0]["seconds"]
+                for impl, fn in fns.items():
+                    rec, peak, out, slower = cases[impl]
+                    status = []
+                    if fn is not reference:
+                        try:
+                            check(cases["reference"][2], out)
+                        except AssertionError as e:
+                            status.append("MISMATCH " + str(e).strip().splitlines()[0])
+                    if accept:
+                        rec["accepted"] = True
+                        slower = [f"accepted {found}" for found in slower]
+                    if status or (slower and not accept):
+                        failures.append((rec, status + slower))
+                    status += slower
+                    records.append(rec)
+                    print(f"{name:<17}{impl:<11}{n_symbols:>8}{n_days:>6}{rec['seconds'] * 1e3:>11.2f}"
+                          f"{ref_seconds / rec['seconds']:>8.1f}{peak:>9.1f}  {'; '.join(status) or 'ok'}")
+
+    # A failing run never joins the history, or a few regressed runs would become the baseline;
+    # --accept waives the regressions (never a mismatch) and restarts the baseline from this run
+    if record and not failures:
+        with open(history_path, "a") as f:
+            for rec in records:
+                f.write(json.dumps(rec) + "\n")
+    return records, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Returns-kernel microbenchmarks with equivalence and regression checks")
+    parser.add_argument("--grid", choices=list(GRIDS), default="quick")
+    parser.add_argument("--kernel", action="append", choices=list(KERNELS), help="run only these kernels")
+    parser.add_argument("--no-record", action="store_true", help="don't append this run to the history (failing runs never are)")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--history", default=BENCH_HISTORY)
+    parser.add_argument("--accept", action="store_true",
+                        help="an intended slowdown: record this run as the new baseline instead of failing")
+    args = parser.parse_args(argv)
+    if args.accept and args.no_record:
+        parser.error("--accept records the run; drop --no-record")
+
+    _, failures = run(
+        GRIDS[args.grid], args.kernel or list(KERNELS), not args.no_record,
+        args.time_tolerance, args.memory_tolerance, args.history, args.accept,
+    )
+    if failures:
+        print(f"\n{len(failures)} failing case(s)")
+        for rec, status in failures:
+            print(f"  {rec['kernel']}/{rec['impl']} {rec['symbols']}x{rec['days']}: {'; '.join(status)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Arrow/Parquet snapshots of what the trackers compute, for notebooks and
+other local tools:
+
+    from data_export import read_export
+    prices = read_export("vega", "prices", symbols=["AAPL", "MSFT"], start="2025-06-01")
+
+Each page writes its snapshot under EXPORT_DIR/<portfolio>/ whenever its
+data changes, in both formats: Parquet for compact storage with row-group
+date statistics, Arrow IPC for memory-mapped zero-copy reads.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from tracker_stats import cohort_value
+
+# === CONFIGURATION ===
+EXPORT_DIR = os.environ.get("TRACKER_EXPORT_DIR", ".tracker_export")
+TABLES = ("prices", "returns", "cohorts")
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+MIME_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+ROW_GROUP_SIZE = 64   # sessions per Parquet row group: a date filter skips whole groups
+
+
+# === Tables ===
+def _wide_table(frame):
+    """Date-indexed frame as a table with a `date` column; float columns are wrapped, not copied."""
+    columns = {"date": pa.array(frame.index.values)}
+    for name in frame.columns:
+        columns[str(name)] = pa.array(np.ascontiguousarray(frame[name].to_numpy(dtype=float)))
+    return pa.table(columns)
+
+
+def export_tables(dataset, cohorts):
+    """
+    The dataset as Arrow tables:
+      prices  - date x symbol closes, as aligned in the tracker (NaN before a listing)
+      returns - one row per symbol: return (%) since the first close
+      cohorts - date x cohort equal-weight value (1.0 at the start), plus the benchmark
+    """
+    prices = dataset.prices
+    returns = dataset.returns
+    curves = pd.DataFrame(
+        {label: cohort_value(prices, symbols) for label, symbols in cohorts.items()},
+        index=prices.index,
+    )
+    bench = dataset.series(dataset.benchmark)
+    if not bench.empty:
+        curves[dataset.benchmark] = bench / bench.iloc[0]
+    return {
+        "prices": _wide_table(prices),
+        "returns": pa.table({
+            "symbol": pa.array(returns.index.astype(str)),
+            "return_pct": pa.array(returns.to_numpy(dtype=float)),
+        }),
+        "cohorts": _wide_table(curves),
+    }
+
+
+def filter_table(table, symbols=None, start=None, end=None):
+    """
+    Keep `symbols` and the dates in [start, end].
+
+    Wide tables select columns and slice the sorted date column, which
+    copies nothing; the long returns table filters its `symbol` rows.
+    """
+    names = table.column_names
+    if symbols:
+        if "symbol" in names:
+            table = table.filter(pc.is_in(table["symbol"], value_set=pa.array(list(symbols), pa.string())))
+        else:
+            table = table.select(["date", *[s for s in symbols if s in names]])
+    if "date" in names and (start is not None or end is not None):
+        dates = table["date"].to_numpy()
+        lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), "left") if start is not None else 0
+        hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), "right") if end is not None else len(dates)
+        table = table.slice(lo, max(hi - lo, 0))
+    return table
+
+
+def to_bytes(table, fmt):
+    """Serialize a table as a Parquet or Arrow IPC file."""
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        pq.write_table(table, sink, row_group_size=ROW_GROUP_SIZE)
+    else:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# === Snapshots on disk ===
+def _manifest_path(directory, name):
+    return os.path.join(directory, name, "manifest.json")
+
+
+def write_exports(name, dataset, cohorts, directory=EXPORT_DIR):
+    """Write every table for portfolio `name` in both formats, unless this data version is already there."""
+    manifest = _manifest_path(directory, name)
+    try:
+        with open(manifest) as f:
+            if json.load(f).get("version") == dataset.version:
+                return False
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(os.path.dirname(manifest), exist_ok=True)
+    for table_name, table in export_tables(dataset, cohorts).items():
+        for fmt, ext in FORMATS.items():
+            path = os.path.join(directory, name, table_name + ext)
+            tmp = f"{path}.tmp"
+            if fmt == "parquet":
+                pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+            else:
+                with pa.OSFile(tmp, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+
+    with open(f"{manifest}.tmp", "w") as f:
+        json.dump({
+            "version": dataset.version,
+            "benchmark": dataset.benchmark,
+            "from_date": dataset.from_date,
+            "to_date": dataset.to_date,
+            "failed": dataset.failed_symbols,
+        }, f)
+    os.replace(f"{manifest}.tmp", manifest)
+    return True
+
+
+def read_export(name, table, symbols=None, start=None, end=None, fmt="parquet", directory=EXPORT_DIR):
+    """
+    Read one exported table with the filters pushed into the reader.
+
+    Parquet reads only the requested symbol columns and skips row groups
+    outside [start, end] by their statistics; Arrow IPC memory-maps the
+    file, so the selection shares the mapped buffers instead of copying.
+    """
+    if table not in TABLES:
+        raise ValueError(f"unknown table {table!r}, expected one of {TABLES}")
+    path = os.path.join(directory, name, table + FORMATS[fmt])
+
+    if fmt == "arrow":
+        return filter_table(ipc.open_file(pa.memory_map(path)).read_all(), symbols, start, end)
+
+    schema = pq.read_schema(path)
+    columns, filters = None, []
+    if symbols and "symbol" in schema.names:
+        filters.append(("symbol", "in", list(symbols)))
+    elif symbols:
+        columns = ["date", *[s for s in symbols if s in schema.names]]
+    if "date" in schema.names:
+        if start is not None:
+            filters.append(("date", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("date", "<=", pd.Timestamp(end)))
+    return pq.read_table(path, columns=columns, filters=filters or None)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+# === CONFIGURATION ===
+POINT_BUDGET = 1500   # max points sent to the browser per trace
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: pick `n_out` indices of (x, y) that keep
+    the visual shape of the line. Always keeps the first and last point.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # n_out - 2 buckets over the interior points
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_series(s, budget=POINT_BUDGET):
+    """LTTB-downsample a date-indexed Series to at most `budget` points."""
+    s = s.dropna()
+    if len(s) <= budget:
+        return s
+    x = pd.DatetimeIndex(s.index).asi8
+    return s.iloc[lttb_indices(x, s.to_numpy(), budget)]
+
+
+def value_line(s, budget=POINT_BUDGET, **kwargs):
+    """WebGL line trace for a date-indexed Series, downsampled past `budget`."""
+    import plotly.graph_objects as go
+
+    s = downsample_series(s, budget)
+    return go.Scattergl(x=s.index, y=s.to_numpy(), mode="lines", **kwargs)
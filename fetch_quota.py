@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from rolling_stats import STATE_DIR
+
+# === CONFIGURATION ===
+DAILY_BUDGET = int(os.environ.get("FMP_DAILY_BUDGET", 250))        # FMP calls per UTC day; 0 = unlimited
+RESERVE = float(os.environ.get("FMP_BUDGET_RESERVE", 0.2))         # share kept back for priority fetches
+PRIORITY_SYMBOLS = int(os.environ.get("FMP_PRIORITY_SYMBOLS", 30))  # ranks (after the benchmark) that may use it
+USAGE_PATH = os.environ.get("FMP_USAGE_PATH", os.path.join(STATE_DIR, "fmp_usage.json"))
+
+
+class QuotaExhausted(RuntimeError):
+    """Raised by optional fetches (live quotes) when the daily budget can't cover them."""
+
+
+_lock = threading.Lock()
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _fresh(usage):
+    return usage if usage.get("day") == _today() else {"day": _today(), "calls": 0}
+
+
+def _read():
+    """Today's usage under a shared lock; reads never rewrite the file."""
+    try:
+        with open(USAGE_PATH) as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            usage = json.load(f)
+    except (OSError, ValueError):
+        usage = {}
+    return _fresh(usage)
+
+
+def _update(change):
+    """
+    Read today's usage, apply `change(usage)` and write it back.
+
+    The file is shared by every process on the host (flock'd where
+    available), so several apps drawing on one API key see one count.
+    """
+    with _lock:
+        os.makedirs(os.path.dirname(USAGE_PATH) or ".", exist_ok=True)
+        with open(USAGE_PATH, "a+") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                usage = json.loads(f.read() or "{}")
+            except ValueError:
+                usage = {}
+            usage = _fresh(usage)
+            result = change(usage)
+            f.seek(0)
+            f.truncate()
+            json.dump(usage, f)
+    return usage, result
+
+
+def _limit(essential):
+    """Calls a fetch may take the count up to: the whole budget for priority fetches, less the reserve otherwise."""
+    return DAILY_BUDGET if essential else int(DAILY_BUDGET * (1 - RESERVE))
+
+
+def calls_used():
+    return _read()["calls"]
+
+
+def has_room(essential=False, calls=1):
+    return DAILY_BUDGET <= 0 or calls_used() + calls <= _limit(essential)
+
+
+def acquire(essential=False, calls=1):
+    """Count `calls` against today's budget if they fit; False means defer the fetch."""
+    if DAILY_BUDGET <= 0:
+        _update(lambda usage: usage.update(calls=usage["calls"] + calls))
+        return True
+
+    def take(usage):
+        if usage["calls"] + calls > _limit(essential):
+            return False
+        usage["calls"] += calls
+        return True
+
+    return _update(take)[1]
+
+
+def is_essential(priority):
+    """Fetch order 0 is the benchmark, then prediction rank 1, 2, ..."""
+    return priority <= PRIORITY_SYMBOLS
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+
+def cohort_rows(portfolios):
+    """One leaderboard row per (portfolio, cohort): (label, portfolio, symbols)."""
+    rows = []
+    for p in portfolios:
+        cohorts = p.cohort_map
+        for label, symbols in cohorts.items():
+            name = p.page_title if len(cohorts) == 1 else f"{p.page_title} · {label}"
+            rows.append((name, p, symbols))
+    return rows
+
+
+def universe(portfolios):
+    """
+    Union of every symbol and benchmark, plus the widest date window needed.
+
+    Symbols come in fetch priority: benchmarks, then every portfolio's rank 1,
+    every rank 2, and so on, so all top cohorts load before any tail.
+    """
+    depth = max((len(p.tickers) for p in portfolios), default=0)
+    by_rank = (p.tickers[i] for i in range(depth) for p in portfolios if i < len(p.tickers))
+    symbols = list(dict.fromkeys([*(p.benchmark for p in portfolios), *by_rank]))
+    start = min(p.purchase_date for p in portfolios)
+    end = max(p.to_date() for p in portfolios)
+    return symbols, start, end
+
+
+def basket_values(prices, rows):
+    """
+    Value of $1 in each cohort row's basket, then in its benchmark, over time.
+
+    Each leg is an equal-weight buy-and-hold basket bought at the first close
+    on or after the row's purchase date (a symbol that starts later is bought
+    at its own first close), so its value is held-shares x prices. Stacking a
+    weight row per cohort and per benchmark leg gives values = prices @ weights.T.
+    Returns (values, members, base, px): the (T, 2k) values (NaN before each
+    start), the (2k, n) membership and buy prices, and the filled prices.
+    """
+    cols = {s: i for i, s in enumerate(prices.columns)}
+    px = prices.ffill().bfill().to_numpy(dtype=float)
+    dates = prices.index
+
+    k, n = len(rows), len(cols)
+
+    # membership: cohort legs first, benchmark legs after
+    members = np.zeros((2 * k, n))
+    for r, (_, p, symbols) in enumerate(rows):
+        idx = [cols[s] for s in symbols if s in cols]
+        if idx:
+            members[r, idx] = 1 / len(idx)
+        if p.benchmark in cols:
+            members[k + r, cols[p.benchmark]] = 1.0
+    if not len(dates):      # no prices loaded yet: no buy dates either
+        return np.empty((0, 2 * k)), members, np.full((2 * k, n), np.nan), px
+
+    starts = np.array([dates.searchsorted(pd.Timestamp(p.purchase_date)) for _, p, _ in rows], dtype=int)
+    starts = np.minimum(starts, len(dates) - 1)
+    starts = np.concatenate([starts, starts])
+    base = px[starts]                                        # (2k, n) buy prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(members > 0, members / base, 0.0)   # shares held per $1
+    values = np.nan_to_num(px) @ weights.T                  # (T, 2k)
+
+    before_start = np.arange(len(dates))[:, None] < starts[None, :]
+    values[before_start] = np.nan
+    values[:, members.sum(axis=1) == 0] = np.nan
+    return values, members, base, px
+
+
+def evaluate(prices, portfolios):
+    """
+    Value every cohort and its benchmark over time in one matrix product
+    (see basket_values). Returns (curves, table): value indexed to 100 at
+    each start, and the current return, benchmark return and excess per cohort.
+    """
+    rows = cohort_rows(portfolios)
+    dates = prices.index
+    k = len(rows)
+    values, members, _, _ = basket_values(prices, rows)
+
+    names = [name for name, _, _ in rows]
+    curves = pd.DataFrame(values[:, :k] * 100, index=dates, columns=names)
+    bench_curves = pd.DataFrame(values[:, k:] * 100, index=dates, columns=names)
+
+    ret = curves.iloc[-1] - 100 if len(dates) else pd.Series(np.nan, index=names)
+    bench_ret = bench_curves.iloc[-1] - 100 if len(dates) else pd.Series(np.nan, index=names)
+    table = pd.DataFrame({
+        "Since": [p.purchase_date for _, p, _ in rows],
+        "Holdings": [f"{int((members[r] > 0).sum())}/{len(symbols)}" for r, (_, _, symbols) in enumerate(rows)],
+        "Return (%)": ret.to_numpy(),
+        "Benchmark": [p.benchmark for _, p, _ in rows],
+        "Benchmark Return (%)": bench_ret.to_numpy(),
+        "Excess (%)": (ret - bench_ret).to_numpy(),
+    }, index=pd.Index(names, name="Portfolio"))
+    return curves, table.sort_values("Excess (%)", ascending=False)
@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import requests
+
+from fetch_quota import QuotaExhausted, acquire
+from tracker_data import FMP_BASE_URL
+from trading_calendar import MARKET_TZ, market_now, session_close
+
+# === CONFIGURATION ===
+FMP_QUOTE_URL = FMP_BASE_URL + "/api/v3/quote/{symbols}?apikey={api_key}"
+QUOTE_BATCH = 100                                         # symbols per quote request
+LIVE_INTERVAL = int(os.environ.get("LIVE_QUOTE_INTERVAL", 60))   # seconds between polls
+MAX_TICKS = 500                                           # intraday points kept per board
+MAX_BOARDS = 32
+
+
+# === FMP batch quotes ===
+def fetch_quotes(symbols, api_key, session=requests, batch=QUOTE_BATCH):
+    """
+    Latest price per symbol, `batch` symbols per request; raises on HTTP errors.
+
+    Quotes are optional, so each request must fit the daily FMP budget short
+    of the reserve kept for price histories, else QuotaExhausted is raised.
+    """
+    prices, stamps = {}, []
+    symbols = list(symbols)
+    for i in range(0, len(symbols), batch):
+        if not acquire():
+            raise QuotaExhausted("daily FMP budget reached")
+        url = FMP_QUOTE_URL.format(symbols=",".join(symbols[i:i + batch]), api_key=api_key)
+        res = session.get(url)
+        res.raise_for_status()
+        for q in res.json():
+            if q.get("price") is not None:
+                prices[q["symbol"]] = float(q["price"])
+                if q.get("timestamp"):
+                    stamps.append(q["timestamp"])
+    # FMP stamps are epoch seconds; shown in New York time like every other date on the page
+    as_of = pd.Timestamp(max(stamps), unit="s", tz="UTC").tz_convert(MARKET_TZ) if stamps else market_now()
+    return pd.Series(prices, dtype=float), as_of
+
+
+# === Shared quote store ===
+# Every open page polls on its own timer; quotes younger than `max_age` are
+# reused so N sessions watching overlapping portfolios cost one set of calls
+_quotes = {}          # symbol -> (price, as_of, fetched_at)
+_quotes_lock = threading.Lock()
+
+
+def get_quotes(symbols, api_key, max_age=LIVE_INTERVAL, session=requests):
+    """Latest prices for `symbols`, fetching only the ones older than `max_age` seconds."""
+    now = time.monotonic()
+    with _quotes_lock:
+        stale = [s for s in symbols if s not in _quotes or now - _quotes[s][2] >= max_age]
+    if stale:
+        fresh, as_of = fetch_quotes(stale, api_key, session)
+        with _quotes_lock:
+            for symbol, price in fresh.items():
+                _quotes[symbol] = (price, as_of, now)
+    with _quotes_lock:
+        held = {s: _quotes[s] for s in symbols if s in _quotes}
+    if not held:
+        return pd.Series(dtype=float), None
+    return pd.Series({s: q[0] for s, q in held.items()}), max(q[1] for q in held.values())
+
+
+# === Live board ===
+class LiveBoard:
+    """
+    A dataset's price matrix with only its latest row live.
+
+    The history is never copied or touched: the board keeps each symbol's
+    first close, last close and a patched copy of the last row as vectors,
+    so a quote tick costs O(symbols) however long the history is.
+    """
+
+    def __init__(self, prices):
+        self.columns = prices.columns
+        self.first = prices.bfill().iloc[0].to_numpy(dtype=float) if len(prices) else np.full(len(prices.columns), np.nan)
+        self.close = prices.iloc[-1].to_numpy(dtype=float) if len(prices) else np.full(len(prices.columns), np.nan)
+        self.latest = self.close.copy()
+        self.as_of = session_close(prices.index[-1]) if len(prices) else None
+        self.ticks = deque(maxlen=MAX_TICKS)    # (as_of, latest row) per poll
+        self.lock = threading.Lock()
+
+    def patch(self, quotes, as_of):
+        """Overwrite the latest price of every quoted symbol; unquoted ones keep their close."""
+        idx = self.columns.get_indexer(quotes.index)
+        hit = idx >= 0
+        with self.lock:
+            self.latest[idx[hit]] = quotes.to_numpy(dtype=float)[hit]
+            if as_of is not None and (not self.ticks or as_of > self.ticks[-1][0]):
+                self.as_of = as_of
+                self.ticks.append((as_of, self.latest.copy()))
+
+    def returns(self):
+        """Return (%) since the first close at the latest price; matches dataset.returns before any patch."""
+        return pd.Series((self.latest / self.first - 1) * 100, index=self.columns)
+
+    def day_change(self):
+        """Move (%) from the last close in the history to the latest price."""
+        return pd.Series((self.latest / self.close - 1) * 100, index=self.columns)
+
+    def cohort_weights(self, cohorts):
+        """Equal-weight membership matrix (cohort x symbol) over the loaded symbols."""
+        weights = np.zeros((len(cohorts), len(self.columns)))
+        for r, symbols in enumerate(cohorts.values()):
+            idx = self.columns.get_indexer(symbols)
+            idx = idx[idx >= 0]
+            if len(idx):
+                weights[r, idx] = 1 / len(idx)
+        return weights
+
+    def cohort_returns(self, cohorts, row=None):
+        """Mean return per cohort at `row` (default: the latest prices), as the tracker tables average it."""
+        row = self.latest if row is None else row
+        r = np.nan_to_num((row / self.first - 1) * 100)
+        return pd.Series(self.cohort_weights(cohorts) @ r, index=list(cohorts))
+
+    def tick_frame(self, cohorts, benchmark):
+        """Return (%) per cohort and the benchmark at every poll so far today."""
+        with self.lock:
+            ticks = list(self.ticks)
+        if not ticks:
+            return pd.DataFrame(columns=[*cohorts, benchmark])
+        rows = np.vstack([row for _, row in ticks])
+        rets = np.nan_to_num((rows / self.first - 1) * 100)
+        frame = pd.DataFrame(
+            rets @ self.cohort_weights(cohorts).T,
+            index=pd.DatetimeIndex([t for t, _ in ticks]),
+            columns=list(cohorts),
+        )
+        if benchmark in self.columns:
+            frame[benchmark] = rets[:, self.columns.get_loc(benchmark)]
+        return frame
+
+
+_boards = {}
+_boards_lock = threading.Lock()
+
+
+def live_board(dataset):
+    """The shared board for a dataset, one per price version."""
+    with _boards_lock:
+        board = _boards.get(dataset.version)
+        if board is None:
+            if len(_boards) >= MAX_BOARDS:
+                _boards.pop(next(iter(_boards)))
+            board = _boards[dataset.version] = LiveBoard(dataset.prices)
+        return board
+
+
+def refresh_board(board, api_key, max_age=LIVE_INTERVAL, session=requests):
+    """Poll quotes for every symbol on the board and patch its latest row."""
+    quotes, as_of = get_quotes(list(board.columns), api_key, max_age, session)
+    board.patch(quotes, as_of)
+    return board
@@ -0,0 +1,74 @@
+"""
+Local stand-in for the FMP endpoints the trackers use, for trying live mode
+without an API key or quota:
+
+    python mock_fmp_server.py --port 8765
+    FMP_BASE_URL=http://127.0.0.1:8765 LIVE_QUOTE_INTERVAL=5 streamlit run app.py
+
+Histories are seeded per symbol so every run sees the same closes; quotes
+random-walk away from the last close on every request.
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+_live = {}
+_live_lock = threading.Lock()
+
+
+def history(symbol, from_date, to_date):
+    """Deterministic business-day closes for `symbol`, newest first like FMP."""
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    dates = pd.bdate_range("2020-01-01", pd.Timestamp.today().normalize())
+    closes = (20 + rng.random() * 300) * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+    s = pd.Series(closes, index=dates).loc[from_date:to_date]
+    return [{"date": d.strftime("%Y-%m-%d"), "close": round(float(c), 4)} for d, c in s[::-1].items()]
+
+
+def quote(symbol, rng):
+    with _live_lock:
+        if symbol not in _live:
+            _live[symbol] = history(symbol, "2020-01-01", "2100-01-01")[0]["close"]
+        _live[symbol] = round(_live[symbol] * float(np.exp(rng.normal(0, 0.002))), 4)
+        price = _live[symbol]
+    return {"symbol": symbol, "price": price, "timestamp": int(time.time())}
+
+
+class Handler(BaseHTTPRequestHandler):
+    rng = np.random.default_rng()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if parts[:3] == ["api", "v3", "quote"] and len(parts) == 4:
+            body = [quote(s, self.rng) for s in parts[3].split(",") if s]
+        elif parts[:3] == ["api", "v3", "historical-price-full"] and len(parts) == 4:
+            symbol = parts[3]
+            body = {"symbol": symbol, "historical": history(symbol, query.get("from"), query.get("to"))}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Mock FMP on http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,126 @@
+import os
+import re
+from dataclasses import dataclass, field
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from trading_calendar import last_session, previous_session
+
+# === CONFIGURATION ===
+PORTFOLIO_DIR = os.environ.get(
+    "PORTFOLIO_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolios")
+)
+LAYOUTS = ("basic", "ranked", "value")
+# "today": the last completed NYSE session; "previous_business_day": the session before today's
+END_DATES = ("today", "previous_business_day")
+COHORT_COLORS = ("#057DC9", "#288CFF", "#4FB7FF")
+# return / excess / drawdown are per cohort (%), holding_return per symbol since purchase (%)
+ALERT_METRICS = ("return", "excess", "drawdown", "holding_return")
+ALERT_CONDITION = re.compile(r"^\s*(\w+)\s*(<=|>=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+@dataclass(frozen=True)
+class Cohort:
+    label: str                 # table label, e.g. "Top 10"
+    size: int | None = None    # first `size` tickers by rank; None = all of them
+    chart_label: str = ""      # bar label, e.g. "📦 Top 10"
+    color: str = ""
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    when: str                  # condition, e.g. "excess < 0" or "holding_return < -15"
+    metric: str
+    op: str
+    threshold: float
+    cohort: str = "*"          # cohort label, or "*" for every cohort
+    name: str = ""
+
+    @property
+    def title(self):
+        return self.name or self.when
+
+
+def parse_condition(when):
+    """Split "metric op threshold" into its parts; raises ValueError if malformed."""
+    m = ALERT_CONDITION.match(when)
+    if not m or m.group(1) not in ALERT_METRICS:
+        raise ValueError(f"bad alert condition {when!r}, expected '<metric> <op> <number>' with metric in {ALERT_METRICS}")
+    return m.group(1), m.group(2), float(m.group(3))
+
+
+@dataclass(frozen=True)
+class Portfolio:
+    """One tracked portfolio, as declared in portfolios/<key>.toml."""
+
+    key: str
+    title: str
+    page_title: str
+    layout: str
+    purchase_date: str
+    tickers: tuple             # in prediction-rank order
+    icon: str = "📈"
+    benchmark: str = "SPY"
+    investment: float = 100
+    end_date: str = "today"
+    subtitle: str = ""
+    description: str = ""
+    chart_title: str = ""
+    table_title: str = ""
+    order: int = 0
+    cohorts: tuple = field(default_factory=tuple)
+    alerts: tuple = field(default_factory=tuple)
+
+    @property
+    def cohort_map(self):
+        """{label: symbols} for every cohort, in declaration order."""
+        return {c.label: list(self.tickers[:c.size]) for c in self.cohorts}
+
+    def to_date(self, now=None):
+        """Last trading session this portfolio reports through, as YYYY-MM-DD."""
+        session = previous_session(now) if self.end_date == "previous_business_day" else last_session(now)
+        return session.strftime("%Y-%m-%d")
+
+
+def load_portfolio(path):
+    with open(path, "rb") as f:
+        raw = tomllib.load(f)
+
+    key = raw.pop("key", os.path.splitext(os.path.basename(path))[0])
+    cohorts = raw.pop("cohorts", None) or [{"label": "Portfolio"}]
+    alerts = raw.pop("alerts", [])
+    try:
+        alerts = tuple(AlertRule(**a, **dict(zip(("metric", "op", "threshold"), parse_condition(a["when"])))) for a in alerts)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+    portfolio = Portfolio(
+        key=key,
+        tickers=tuple(raw.pop("tickers")),
+        cohorts=tuple(
+            Cohort(**{"color": COHORT_COLORS[min(i, len(COHORT_COLORS) - 1)], **c})
+            for i, c in enumerate(cohorts)
+        ),
+        alerts=alerts,
+        **raw,
+    )
+    if portfolio.layout not in LAYOUTS:
+        raise ValueError(f"{path}: unknown layout {portfolio.layout!r}, expected one of {LAYOUTS}")
+    if portfolio.end_date not in END_DATES:
+        raise ValueError(f"{path}: unknown end_date {portfolio.end_date!r}, expected one of {END_DATES}")
+    for rule in portfolio.alerts:
+        if rule.cohort != "*" and rule.cohort not in portfolio.cohort_map:
+            raise ValueError(f"{path}: alert {rule.title!r} names unknown cohort {rule.cohort!r}")
+    return portfolio
+
+
+def load_portfolios(directory=PORTFOLIO_DIR):
+    """Every portfolio under `directory`, sorted by `order` then key."""
+    portfolios = [
+        load_portfolio(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name.endswith(".toml")
+    ]
+    return sorted(portfolios, key=lambda p: (p.order, p.key))
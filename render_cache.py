@@ -0,0 +1,56 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# === CONFIGURATION ===
+MAX_ARTIFACTS = 128   # built figures/tables kept per server process
+
+_artifacts = OrderedDict()
+_lock = threading.Lock()
+
+
+def _feed(h, obj):
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        h.update(type(obj).__name__.encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            h.update(repr(key).encode())
+            _feed(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _feed(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+
+def data_version(*data):
+    """Content hash of price data (Series/DataFrames, dicts and lists of them)."""
+    h = hashlib.blake2b(digest_size=16)
+    for obj in data:
+        _feed(h, obj)
+    return h.hexdigest()
+
+
+def memoize_artifact(name, version, build, **options):
+    """
+    Return the artifact `build(**options)` produced for this data version,
+    building it only on a miss. Cached artifacts are shared across sessions,
+    so callers must treat them as read-only.
+    """
+    key = (name, version, data_version(options))
+    with _lock:
+        if key in _artifacts:
+            _artifacts.move_to_end(key)
+            return _artifacts[key]
+    artifact = build(**options)
+    with _lock:
+        _artifacts[key] = artifact
+        while len(_artifacts) > MAX_ARTIFACTS:
+            _artifacts.popitem(last=False)
+    return artifact
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from tracker_stats import cohort_value
+
+# === CONFIGURATION ===
+TRADING_DAYS = 252
+RISK_COLUMNS = ["Volatility (%)", "Beta", "Correlation", "Sharpe", "Sortino", "Max Drawdown (%)"]
+RISK_FORMAT = {
+    "Volatility (%)": "{:.1f}%",
+    "Beta": "{:.2f}",
+    "Correlation": "{:.2f}",
+    "Sharpe": "{:.2f}",
+    "Sortino": "{:.2f}",
+    "Max Drawdown (%)": "{:.1f}%",
+}
+
+
+def with_cohorts(prices, cohorts):
+    """Append an equal-weight value column per {label: symbols} cohort."""
+    if not cohorts or prices.empty:   # nothing to value yet: no rows to buy at
+        return prices
+    values = {label: cohort_value(prices, symbols) for label, symbols in cohorts.items()}
+    return pd.concat([prices, pd.DataFrame(values, index=prices.index)], axis=1)
+
+
+def risk_metrics(prices, benchmark="SPY", cohorts=None, risk_free=0.0):
+    """
+    Annualized risk metrics for every column of a date x symbol price matrix.
+
+    All columns are computed in one pass over the daily return matrix; missing
+    days are ignored per symbol, and beta/correlation use the days on which
+    both the symbol and the benchmark traded.
+    """
+    prices = with_cohorts(prices, cohorts)
+    if benchmark not in prices.columns or len(prices) < 3:
+        return pd.DataFrame(index=prices.columns, columns=RISK_COLUMNS, dtype=float)
+
+    px = prices.to_numpy(dtype=float)
+    rets = px[1:] / px[:-1] - 1
+    bench = rets[:, prices.columns.get_loc(benchmark)]
+    rf_daily = risk_free / TRADING_DAYS
+
+    # --- Volatility, Sharpe, Sortino ---
+    n = np.sum(~np.isnan(rets), axis=0)
+    mean = np.nanmean(rets, axis=0)
+    std = np.nanstd(rets, axis=0, ddof=1)
+    excess = mean - rf_daily
+    downside = np.sqrt(np.nanmean(np.minimum(rets - rf_daily, 0) ** 2, axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = std * np.sqrt(TRADING_DAYS)
+        sharpe = excess / std * np.sqrt(TRADING_DAYS)
+        sortino = excess / downside * np.sqrt(TRADING_DAYS)
+
+    # --- Beta and correlation on pairwise-valid days ---
+    valid = ~np.isnan(rets) & ~np.isnan(bench)[:, None]
+    n_pair = valid.sum(axis=0)
+    r = np.where(valid, rets, 0.0)
+    b = np.where(valid, bench[:, None], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dr = np.where(valid, r - r.sum(axis=0) / n_pair, 0.0)
+        db = np.where(valid, b - b.sum(axis=0) / n_pair, 0.0)
+        cov = (dr * db).sum(axis=0)
+        var_b = (db ** 2).sum(axis=0)
+        var_r = (dr ** 2).sum(axis=0)
+        beta = cov / var_b
+        corr = cov / np.sqrt(var_r * var_b)
+
+    # --- Max drawdown on the held (forward-filled) price path ---
+    held = prices.ffill().bfill().to_numpy(dtype=float)
+    drawdown = (held / np.maximum.accumulate(held, axis=0) - 1).min(axis=0)
+
+    out = pd.DataFrame({
+        "Volatility (%)": vol * 100,
+        "Beta": beta,
+        "Correlation": corr,
+        "Sharpe": sharpe,
+        "Sortino": sortino,
+        "Max Drawdown (%)": drawdown * 100,
+    }, index=prices.columns)
+    out.loc[n < 2] = np.nan
+    return out
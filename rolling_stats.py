@@ -0,0 +1,175 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# === CONFIGURATION ===
+WINDOWS = (5, 20, 60)
+TRADING_DAYS = 252
+REBASE_EVERY = 252   # re-sum the windows from the buffer to shed float drift
+STATE_DIR = os.environ.get("TRACKER_STATE_DIR", ".tracker_state")
+
+
+class RollingState:
+    """
+    Running rolling-window statistics for a fixed set of symbols and cohorts.
+
+    Keeps the last max(windows) daily log returns in a ring buffer plus running
+    sums and sums of squares per window, so each new bar costs O(symbols)
+    regardless of how much history has been fed in.
+    """
+
+    def __init__(self, symbols, cohorts=None, benchmark="SPY", windows=WINDOWS):
+        self.symbols = list(symbols)
+        if benchmark not in self.symbols:
+            self.symbols.append(benchmark)
+        self.cohorts = {label: list(members) for label, members in (cohorts or {}).items()}
+        self.benchmark = benchmark
+        self.windows = tuple(windows)
+        self.columns = self.symbols + list(self.cohorts)
+
+        n, c, k = len(self.symbols), len(self.cohorts), len(self.windows)
+        self.weights = np.zeros((c, n))
+        for i, members in enumerate(self.cohorts.values()):
+            idx = [self.symbols.index(s) for s in members if s in self.symbols]
+            if idx:
+                self.weights[i, idx] = 1 / len(idx)
+
+        self.depth = max(self.windows)
+        self.buffer = np.zeros((self.depth, n + c))
+        self.sums = np.zeros((k, n + c))
+        self.sumsq = np.zeros((k, n + c))
+        self.base = np.full(n, np.nan)
+        self.last = np.full(n + c, np.nan)
+        self.count = 0
+        self.start_date = None
+        self.last_date = None
+
+    # --- Updates ---
+    def update(self, date, row):
+        """Feed one bar of closes (aligned to `self.symbols`); NaN carries forward."""
+        n = len(self.symbols)
+        px = np.asarray(row, dtype=float)
+        px = np.where(np.isnan(px), self.last[:n], px)
+        self.base = np.where(np.isnan(self.base), px, self.base)
+        rel = np.where(np.isnan(self.base), 1.0, px / self.base)
+        values = np.concatenate([px, self.weights @ rel])
+
+        if self.start_date is None:
+            self.start_date = self.last_date = pd.Timestamp(date)
+            self.last = values
+            return
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.log(values / self.last)
+        r = np.where(np.isfinite(r), r, 0.0)
+
+        for k, w in enumerate(self.windows):
+            if self.count >= w:
+                old = self.buffer[(self.count - w) % self.depth]
+                self.sums[k] -= old
+                self.sumsq[k] -= old ** 2
+        self.buffer[self.count % self.depth] = r
+        self.sums += r
+        self.sumsq += r ** 2
+        self.count += 1
+        if self.count % REBASE_EVERY == 0:
+            self._rebase()
+
+        self.last = values
+        self.last_date = pd.Timestamp(date)
+
+    def advance(self, prices):
+        """Feed every row of `prices` newer than the last bar seen; returns rows fed."""
+        if self.last_date is not None:
+            prices = prices[prices.index > self.last_date]
+        block = prices.reindex(columns=self.symbols).to_numpy(dtype=float)
+        for date, row in zip(prices.index, block):
+            self.update(date, row)
+        return len(prices)
+
+    def revised(self, prices):
+        """
+        Whether `prices` changes a close already fed at `last_date`: a bar that
+        was forward-filled (benchmark lagging, symbol stale on quota) since filled in.
+        """
+        if self.last_date is None or self.last_date not in prices.index:
+            return False
+        row = prices.loc[self.last_date].reindex(self.symbols).to_numpy(dtype=float)
+        return bool(np.any(~np.isnan(row) & (row != self.last[:len(self.symbols)])))
+
+    def _rebase(self):
+        for k, w in enumerate(self.windows):
+            m = min(self.count, w)
+            rows = self.buffer[[(self.count - 1 - j) % self.depth for j in range(m)]]
+            self.sums[k] = rows.sum(axis=0)
+            self.sumsq[k] = (rows ** 2).sum(axis=0)
+
+    # --- Reads ---
+    def snapshot(self):
+        """Rolling return, annualized volatility and excess vs benchmark (%)."""
+        bench = self.columns.index(self.benchmark)
+        out = {}
+        for k, w in enumerate(self.windows):
+            if self.count < w:
+                ret = vol = np.full(len(self.columns), np.nan)
+            else:
+                ret = np.expm1(self.sums[k]) * 100
+                var = np.maximum(self.sumsq[k] - self.sums[k] ** 2 / w, 0) / (w - 1)
+                vol = np.sqrt(var * TRADING_DAYS) * 100
+            out[f"Return {w}d (%)"] = ret
+            out[f"Vol {w}d (%)"] = vol
+            out[f"Excess {w}d (%)"] = ret - ret[bench]
+        return pd.DataFrame(out, index=self.columns)
+
+    # --- Persistence ---
+    def signature(self):
+        return json.dumps([self.symbols, self.cohorts, self.benchmark, self.windows])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            signature=self.signature(),
+            dates=np.array([str(self.start_date), str(self.last_date)]),
+            count=self.count,
+            buffer=self.buffer, sums=self.sums, sumsq=self.sumsq,
+            base=self.base, last=self.last,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, symbols, cohorts=None, benchmark="SPY", windows=WINDOWS):
+        """Restore a saved state, or None if missing or built for another config."""
+        state = cls(symbols, cohorts, benchmark, windows)
+        try:
+            with np.load(path) as f:
+                if str(f["signature"]) != state.signature():
+                    return None
+                start, last = f["dates"]
+                state.start_date, state.last_date = pd.Timestamp(str(start)), pd.Timestamp(str(last))
+                state.count = int(f["count"])
+                for name in ("buffer", "sums", "sumsq", "base", "last"):
+                    setattr(state, name, f[name])
+        except (OSError, KeyError, ValueError):
+            return None
+        return state
+
+
+def advance_rolling_state(name, prices, cohorts=None, benchmark="SPY", windows=WINDOWS):
+    """
+    Load the persisted state for tracker `name`, feed it only the bars it
+    hasn't seen yet and save it back. Rebuilds from scratch when the symbols,
+    cohorts or start date changed, or when the last bar it was fed has since
+    been corrected (the dropped buffer rows can't be recovered to back it out).
+    """
+    path = os.path.join(STATE_DIR, f"rolling_{name}.npz")
+    symbols = [s for s in prices.columns if s != benchmark]
+    state = RollingState.load(path, symbols, cohorts, benchmark, windows)
+    if state is None or prices.empty or state.start_date != prices.index[0] or state.revised(prices):
+        state = RollingState(symbols, cohorts, benchmark, windows)
+    if state.advance(prices):
+        state.save(path)
+    return state
@@ -0,0 +1,63 @@
+"""
+Cold-start timing and price-cache prewarming.
+
+app.py imports this first, marks each boot step and writes a report after
+the first page has rendered (STATE_DIR/startup.json plus one stderr line).
+To ship an image that starts warm, prewarm the price snapshot at build time:
+
+    FMP_API_KEY=... python startup.py --prewarm
+"""
+import json
+import os
+import sys
+import time
+from functools import partial
+
+BOOT = time.perf_counter()
+_marks = []
+_reported = False
+
+
+def mark(label, **info):
+    """Record seconds since boot for `label`; ignored once the report is out."""
+    if not _reported:
+        _marks.append({"step": label, "seconds": round(time.perf_counter() - BOOT, 3), **info})
+
+
+def report(**info):
+    """Write the startup report once per process and return it."""
+    global _reported
+    if _reported:
+        return None
+    mark("first page rendered", **info)
+    _reported = True
+
+    from rolling_stats import STATE_DIR
+
+    path = os.path.join(STATE_DIR, "startup.json")
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(_marks, f, indent=1)
+    sys.stderr.write("startup: " + ", ".join(f"{m['step']} {m['seconds']:.2f}s" for m in _marks) + "\n")
+    return _marks
+
+
+def prewarm():
+    """Fetch every portfolio's prices through the last session and save the snapshot."""
+    from alerts import load_universe
+    from portfolio_config import load_portfolios
+    from tracker_data import PRICE_SNAPSHOT, build_dataset, save_price_snapshot
+
+    portfolios = load_portfolios()
+    dataset = load_universe(portfolios, partial(build_dataset, api_key=os.environ["FMP_API_KEY"]))
+    save_price_snapshot(force=True)
+    print(f"prewarmed {len(dataset.prices.columns)} symbols through {dataset.to_date} into {PRICE_SNAPSHOT}")
+    if dataset.failed:
+        print("failed:", ", ".join(dataset.failed_symbols))
+
+
+if __name__ == "__main__":
+    if "--prewarm" in sys.argv[1:]:
+        prewarm()
+    else:
+        print(__doc__.strip())
@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+from fetch_quota import acquire, has_room, is_essential
+from render_cache import data_version
+from rolling_stats import STATE_DIR
+from trading_calendar import has_sessions, session_range
+from tracker_stats import price_matrix, total_returns
+
+# === CONFIGURATION ===
+# Point at a local mock (see mock_fmp_server.py) with FMP_BASE_URL=http://127.0.0.1:8765
+FMP_BASE_URL = os.environ.get("FMP_BASE_URL", "https://financialmodelingprep.com").rstrip("/")
+FMP_HISTORY_URL = (
+    FMP_BASE_URL + "/api/v3/historical-price-full/"
+    "{symbol}?from={from_date}&to={to_date}&apikey={api_key}"
+)
+# Price store persisted across restarts; bake one into an image with `python startup.py --prewarm`
+PRICE_SNAPSHOT = os.environ.get("PRICE_SNAPSHOT", os.path.join(STATE_DIR, "prices.npz"))
+# A dataset whose benchmark lacks the last session's close (FMP posts it some
+# time after SESSION_SETTLE_MINUTES) is rebuilt after this many seconds, not held for a day
+LAGGING_TTL = int(os.environ.get("LAGGING_DATASET_TTL", 900))
+
+
+# === FMP price fetcher ===
+def fetch_fmp_price_history(symbol, from_date, to_date, api_key, session=requests):
+    """Daily closes for `symbol` as a date-indexed Series; raises on HTTP errors."""
+    url = FMP_HISTORY_URL.format(symbol=symbol, from_date=from_date, to_date=to_date, api_key=api_key)
+    res = session.get(url)
+    res.raise_for_status()
+    hist = res.json().get("historical", [])
+    if not hist:
+        return pd.Series(dtype=float)
+    df = pd.DataFrame(hist)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date")
+    df.set_index("date", inplace=True)
+    return df["close"]
+
+
+# === Shared price store ===
+# One process serves every portfolio, so a symbol held by several portfolios
+# (and the benchmark) is fetched once and sliced to each window
+_history = {}
+_history_lock = threading.Lock()
+_history_dirty = False
+
+
+def get_price_history(symbol, from_date, to_date, api_key, session=requests):
+    """Closes for `symbol` in [from_date, to_date], fetching only what the store doesn't cover."""
+    global _history_dirty
+    with _history_lock:
+        held = _history.get(symbol)
+    if held is None or held[0] > from_date:
+        lo = min(from_date, held[0]) if held else from_date
+        s = fetch_fmp_price_history(symbol, lo, max(to_date, held[1]) if held else to_date, api_key, session)
+        if s.empty:
+            return s
+    elif held[1] < to_date:
+        # Extend forward: only the sessions after the last stored bar
+        after = (held[2].index[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        tail = fetch_fmp_price_history(symbol, after, to_date, api_key, session)
+        if tail.empty:      # not published yet; ask again next time
+            return held[2].loc[from_date:to_date]
+        lo = held[0]
+        s = pd.concat([held[2], tail.loc[tail.index > held[2].index[-1]]])
+    else:
+        return held[2].loc[from_date:to_date]
+
+    # Covered through the last bar FMP returned, not the date asked for: a
+    # session it hadn't published yet is fetched again next time
+    held = (lo, s.index[-1].strftime("%Y-%m-%d"), s)
+    with _history_lock:
+        _history[symbol] = held
+        _history_dirty = True
+    return held[2].loc[from_date:to_date]
+
+
+def store_covers(symbol, from_date, to_date):
+    """Whether the store already holds [from_date, to_date] for `symbol`, i.e. a load costs no call."""
+    with _history_lock:
+        held = _history.get(symbol)
+    return held is not None and held[0] <= from_date and held[1] >= to_date
+
+
+def stored_history(symbol, from_date, to_date):
+    """The store's closes for `symbol` in the window, possibly short of `to_date`; None if it doesn't reach back to `from_date`."""
+    with _history_lock:
+        held = _history.get(symbol)
+    if held is None or held[0] > from_date:
+        return None
+    return held[2].loc[from_date:to_date]
+
+
+def save_price_snapshot(path=PRICE_SNAPSHOT, force=False):
+    """Write the price store to `path` if it changed since the last save."""
+    global _history_dirty
+    with _history_lock:
+        if not (_history_dirty or force) or not _history:
+            return False
+        held = dict(_history)
+        _history_dirty = False
+    symbols = list(held)
+    series = [held[sym][2] for sym in symbols]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp.npz"
+    np.savez_compressed(
+        tmp,
+        symbols=np.array(symbols),
+        ranges=np.array([[held[sym][0], held[sym][1]] for sym in symbols]),
+        counts=np.array([len(s) for s in series]),
+        dates=np.concatenate([s.index.strftime("%Y-%m-%d").to_numpy(dtype=str) for s in series]),
+        closes=np.concatenate([s.to_numpy(dtype=float) for s in series]),
+    )
+    os.replace(tmp, path)
+    return True
+
+
+def restore_price_snapshot(path=PRICE_SNAPSHOT):
+    """Fill the price store from a saved snapshot; symbols already held win. Returns how many were restored."""
+    try:
+        with np.load(path) as f:
+            symbols, ranges, counts = f["symbols"], f["ranges"], f["counts"]
+            dates, closes = f["dates"], f["closes"]
+    except (OSError, KeyError, ValueError):
+        return 0
+    restored = 0
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    days, day_of = np.unique(dates, return_inverse=True)
+    days = pd.to_datetime(days)     # parsed once, the way the fetcher parses them
+    with _history_lock:
+        for i, symbol in enumerate(map(str, symbols)):
+            if symbol in _history:
+                continue
+            lo, hi = offsets[i], offsets[i + 1]
+            if hi == lo:
+                continue
+            index = pd.DatetimeIndex(days[day_of[lo:hi]], name="date")
+            # Older snapshots recorded the requested end; trust only the last stored bar
+            _history[symbol] = (str(ranges[i][0]), index[-1].strftime("%Y-%m-%d"), pd.Series(closes[lo:hi], index=index, name="close"))
+            restored += 1
+    return restored
+
+
+# === Dataset ===
+@dataclass(frozen=True)
+class TrackerDataset:
+    """
+    Everything a tracker page draws from, fetched once per data window.
+
+    Shared across sessions and reruns without copying, so treat `prices`
+    and every derived frame as read-only.
+    """
+
+    symbols: tuple
+    benchmark: str
+    from_date: str
+    to_date: str
+    prices: pd.DataFrame      # date x symbol closes, forward-filled
+    failed: tuple             # ((symbol, reason), ...)
+    version: str              # content hash of `prices`
+    pending: tuple = ()       # symbols deferred until the daily FMP budget allows, most important first
+    stale: tuple = ()         # symbols served from the store without their newest sessions, same reason
+    built_at: float = field(default_factory=time.time)
+
+    @property
+    def lagging(self):
+        """Whether the benchmark's last close is before `to_date`: the session is complete but not yet published."""
+        if not self.has_sessions:
+            return False
+        bench = self.series(self.benchmark)
+        return bench.empty or bench.index[-1] < pd.Timestamp(self.to_date)
+
+    @property
+    def has_sessions(self):
+        """False while no session in the window has closed yet, so there is nothing to fetch."""
+        return has_sessions(self.from_date, self.to_date)
+
+    @property
+    def failed_symbols(self):
+        return [symbol for symbol, _ in self.failed]
+
+    @cached_property
+    def returns(self):
+        """Return (%) since the first close, for every loaded symbol and the benchmark."""
+        if self.prices.empty:
+            return pd.Series(dtype=float)
+        return total_returns(self.prices)
+
+    def series(self, symbol):
+        """Closes for one symbol, without the dates before it started trading."""
+        if symbol not in self.prices.columns:
+            return pd.Series(dtype=float)
+        return self.prices[symbol].dropna()
+
+
+def fetch_order(symbols, benchmark):
+    """
+    Benchmark first, then `symbols` in the given (prediction rank) order, so a
+    tight FMP budget leaves only the least important symbols pending.
+    """
+    return list(dict.fromkeys([benchmark, *symbols]))
+
+
+def build_dataset(symbols, benchmark, from_date, to_date, api_key):
+    session = requests.Session()
+    price_data, failed, pending, stale = {}, [], [], []
+    # No completed session yet: every fetch would be an inverted window charged to the budget
+    order = fetch_order(symbols, benchmark) if has_sessions(from_date, to_date) else []
+    unpublished = False
+    for priority, symbol in enumerate(order):
+        if unpublished:
+            # The benchmark (fetched first) still lacks the last session: FMP hasn't posted
+            # it, so the other tails would come back empty too. Serve what the store has.
+            s = stored_history(symbol, from_date, to_date)
+            if s is not None and not s.empty:
+                price_data[symbol] = s
+                continue
+        if not store_covers(symbol, from_date, to_date) and not acquire(is_essential(priority)):
+            # Out of budget: a stored history short of the last sessions beats dropping the symbol
+            s = stored_history(symbol, from_date, to_date)
+            if s is None or s.empty:
+                pending.append(symbol)
+            else:
+                stale.append(symbol)
+                price_data[symbol] = s
+            continue
+        try:
+            s = get_price_history(symbol, from_date, to_date, api_key, session)
+        except Exception as e:
+            failed.append((symbol, str(e)))
+            continue
+        if s.empty:
+            failed.append((symbol, "no data"))
+        else:
+            price_data[symbol] = s
+        if symbol == benchmark:
+            unpublished = not store_covers(symbol, from_date, to_date)
+
+    save_price_snapshot()
+    # Columns keep the symbols-then-benchmark layout the pages and caches expect
+    prices = price_matrix({s: price_data[s] for s in dict.fromkeys([*symbols, benchmark]) if s in price_data})
+    return TrackerDataset(
+        symbols=tuple(symbols),
+        benchmark=benchmark,
+        from_date=from_date,
+        to_date=to_date,
+        prices=prices,
+        failed=tuple(failed),
+        version=data_version(prices),
+        pending=tuple(pending),
+        stale=tuple(stale),
+    )
+
+
+@st.cache_resource(ttl=86400, show_spinner="📡 Fetching price data...")
+def _load_session_dataset(symbols, benchmark, from_date, to_date):
+    return build_dataset(symbols, benchmark, from_date, to_date, st.secrets["FMP_API_KEY"])
+
+
+def load_dataset(symbols, benchmark, from_date, to_date):
+    """
+    One shared dataset per (symbols, window); a rerun costs a single cache lookup.
+
+    The window is snapped to NYSE sessions first, so weekends and holidays
+    hit the entry of the last session instead of refetching unchanged data.
+    """
+    from_date, to_date = session_range(from_date, to_date)
+    args = (tuple(symbols), benchmark, from_date, to_date)
+    dataset = _load_session_dataset(*args)
+    # Symbols deferred for quota are retried once the budget has room for the most important one,
+    # and a session FMP hadn't published yet is asked for again after LAGGING_TTL
+    deferred = [i for i, s in enumerate(fetch_order(symbols, benchmark)) if s in dataset.pending or s in dataset.stale]
+    if (deferred and has_room(is_essential(deferred[0]))) or (
+        dataset.lagging and time.time() - dataset.built_at >= LAGGING_TTL
+    ):
+        _load_session_dataset.clear(*args)
+        dataset = _load_session_dataset(*args)
+    return dataset
@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# === CONFIGURATION ===
+CHUNK_SIZE = 2000           # resamples generated per vectorized block
+PARALLEL_THRESHOLD = 4000   # below this, a process pool costs more than it saves
+METHODS = ("days", "stocks")
+METHOD_LABELS = {"days": "Daily returns", "stocks": "Stocks within cohort"}
+CI_FORMAT = {
+    "Excess (%)": "{:+.2f}%",
+    "CI Low (%)": "{:+.2f}%",
+    "CI High (%)": "{:+.2f}%",
+    "P(Beat)": "{:.0%}",
+}
+
+_executor = None
+
+
+def _get_executor():
+    # One pool per server process, reused across reruns. Workers come from a
+    # forkserver (spawn where there is none), never a fork of the threaded server
+    global _executor
+    if _executor is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context(method))
+    return _executor
+
+
+# === Price helpers ===
+def price_matrix(price_data):
+    """Align a {symbol: close Series} dict into a date x symbol matrix."""
+    if not price_data:
+        return pd.DataFrame(dtype=float)
+    return pd.DataFrame(price_data).sort_index().ffill()
+
+
+def total_returns(prices):
+    """Buy at the first available close, value at the latest close (%)."""
+    first = prices.bfill().iloc[0]
+    last = prices.iloc[-1]
+    return (last / first - 1) * 100
+
+
+def cohort_value(prices, symbols):
+    """Equal-weight buy-and-hold value of `symbols`, starting at 1.0."""
+    cols = [s for s in symbols if s in prices.columns]
+    rel = prices[cols] / prices[cols].bfill().iloc[0]
+    return rel.bfill().mean(axis=1)
+
+
+# === Resampling kernels ===
+def _resample_days(port_log, bench_log, n, seed):
+    # Draw whole trading days with replacement, same days for both legs
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, port_log.size, size=(n, port_log.size))
+    port = np.expm1(port_log[idx].sum(axis=1))
+    bench = np.expm1(bench_log[idx].sum(axis=1))
+    return (port - bench) * 100
+
+
+def _resample_stocks(stock_returns, bench_return, n, seed):
+    # Rebuild the cohort from its own members, with replacement
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, stock_returns.size, size=(n, stock_returns.size))
+    return stock_returns[idx].mean(axis=1) - bench_return
+
+
+def _run_resamples(kernel, args, n_resamples, seed, parallel):
+    sizes = [CHUNK_SIZE] * (n_resamples // CHUNK_SIZE)
+    if n_resamples % CHUNK_SIZE:
+        sizes.append(n_resamples % CHUNK_SIZE)
+    # Chunk seeds depend only on `seed`, so results don't change with core count
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # One CPU gains nothing from a pool but the pickling
+    if parallel and (os.cpu_count() or 1) > 1 and n_resamples >= PARALLEL_THRESHOLD and len(sizes) > 1:
+        pool = _get_executor()
+        futures = [pool.submit(kernel, *args, n, s) for n, s in zip(sizes, seeds)]
+        chunks = [f.result() for f in futures]
+    else:
+        chunks = [kernel(*args, n, s) for n, s in zip(sizes, seeds)]
+    return np.concatenate(chunks)
+
+
+# === Bootstrap ===
+def bootstrap_excess_return(prices, symbols, benchmark="SPY", method="days",
+                            n_resamples=10000, confidence=0.95, seed=None,
+                            parallel=True):
+    """
+    Bootstrap the excess return (%) of an equal-weight cohort over the benchmark.
+
+    method="days" resamples daily returns of the cohort and benchmark jointly;
+    method="stocks" resamples the cohort's members against the fixed benchmark
+    return. Returns a dict with the point estimate, interval bounds and the
+    share of resamples in which the cohort beat the benchmark.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    cols = [s for s in symbols if s in prices.columns]
+    if not cols or benchmark not in prices.columns or len(prices) < 2:
+        return None
+
+    bench = prices[benchmark].dropna()
+    bench_return = (bench.iloc[-1] / bench.iloc[0] - 1) * 100
+
+    if method == "days":
+        port = cohort_value(prices, cols).reindex(bench.index).ffill()
+        port_log = np.log(port.to_numpy()[1:] / port.to_numpy()[:-1])
+        bench_log = np.log(bench.to_numpy()[1:] / bench.to_numpy()[:-1])
+        point = (port.iloc[-1] / port.iloc[0] - 1) * 100 - bench_return
+        kernel, args = _resample_days, (port_log, bench_log)
+    else:
+        stock_returns = total_returns(prices[cols]).to_numpy()
+        point = stock_returns.mean() - bench_return
+        kernel, args = _resample_stocks, (stock_returns, bench_return)
+
+    samples = _run_resamples(kernel, args, n_resamples, seed, parallel)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples, [alpha, 1 - alpha])
+    return {
+        "excess": float(point),
+        "low": float(low),
+        "high": float(high),
+        "p_beat": float((samples > 0).mean()),
+    }
+
+
+def bootstrap_cohorts(prices, cohorts, benchmark="SPY", method="days",
+                      n_resamples=10000, confidence=0.95, seed=0):
+    """Run `bootstrap_excess_return` for each {label: symbols} cohort."""
+    rows = []
+    for label, symbols in cohorts.items():
+        res = bootstrap_excess_return(prices, symbols, benchmark, method,
+                                      n_resamples, confidence, seed)
+        if res is None:
+            continue
+        rows.append({
+            "Cohort": label,
+            "Excess (%)": res["excess"],
+            "CI Low (%)": res["low"],
+            "CI High (%)": res["high"],
+            "P(Beat)": res["p_beat"],
+        })
+    return pd.DataFrame(rows, columns=["Cohort", *CI_FORMAT])
@@ -0,0 +1,134 @@
+import os
+from functools import lru_cache
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
+# === CONFIGURATION ===
+MARKET_TZ = "America/New_York"
+CLOSE_TIME = pd.Timedelta(hours=16)
+EARLY_CLOSE_TIME = pd.Timedelta(hours=13)
+# FMP posts the day's close a little after the bell; until then the session isn't "completed"
+SETTLE_DELAY = pd.Timedelta(minutes=int(os.environ.get("SESSION_SETTLE_MINUTES", 30)))
+
+# One-off closures the rules below can't know about
+SPECIAL_CLOSURES = (
+    "2012-10-29", "2012-10-30",   # Hurricane Sandy
+    "2018-12-05",                 # President G. H. W. Bush
+    "2025-01-09",                 # President Carter
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE holidays. New Year's on a Saturday is not observed on the Friday before."""
+
+    # Narrower than the 1970-2200 default: the list is built on first use and only recent sessions matter
+    start_date = pd.Timestamp("2000-01-01")
+    end_date = pd.Timestamp("2060-12-31")
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+    def holidays(self, start=None, end=None, return_name=False):
+        rules = super().holidays(start, end, return_name)
+        if return_name:
+            return rules
+        special = pd.DatetimeIndex(SPECIAL_CLOSURES)
+        if start is not None:
+            special = special[special >= pd.Timestamp(start)]
+        if end is not None:
+            special = special[special <= pd.Timestamp(end)]
+        return rules.union(special)
+
+
+@lru_cache(maxsize=None)
+def sessions():
+    """Offset that steps over NYSE sessions; built on first use."""
+    return CustomBusinessDay(calendar=NYSEHolidayCalendar())
+
+
+# === Sessions ===
+def market_now(now=None):
+    """`now` as a New York wall-clock timestamp; naive times are taken as New York time."""
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else pd.Timestamp(now)
+    return now.tz_localize(MARKET_TZ) if now.tzinfo is None else now.tz_convert(MARKET_TZ)
+
+
+def is_session(day):
+    day = pd.Timestamp(day).normalize()
+    return sessions().is_on_offset(day)
+
+
+def session_close(day):
+    """Closing time of the session on `day`, in New York time (1pm on early-close days)."""
+    day = pd.Timestamp(day).normalize()
+    early = (
+        (day.month == 7 and day.day == 3)
+        or (day.month == 12 and day.day == 24)
+        or (day.month == 11 and day.weekday() == 4 and not is_session(day - pd.Timedelta(days=1)))
+    )
+    return (day + (EARLY_CLOSE_TIME if early else CLOSE_TIME)).tz_localize(MARKET_TZ)
+
+
+def session_on_or_before(day):
+    return sessions().rollback(pd.Timestamp(day).normalize())
+
+
+def session_on_or_after(day):
+    return sessions().rollforward(pd.Timestamp(day).normalize())
+
+
+def last_session(now=None):
+    """The last session whose closing data has been published as of `now`."""
+    now = market_now(now)
+    today = now.tz_localize(None).normalize()
+    if is_session(today) and now >= session_close(today) + SETTLE_DELAY:
+        return today
+    return session_on_or_before(today - pd.Timedelta(days=1))
+
+
+def previous_session(now=None):
+    """The last session strictly before `now`'s calendar day, whether or not today's has closed."""
+    today = market_now(now).tz_localize(None).normalize()
+    return session_on_or_before(today - pd.Timedelta(days=1))
+
+
+def session_range(from_date, to_date):
+    """
+    Snap [from_date, to_date] to the sessions it contains, as YYYY-MM-DD strings.
+
+    Every wall-clock date between two sessions maps to the same range, so it
+    makes a stable cache key: nothing is refetched until a new session exists.
+    When the window holds no completed session yet (bought today, before the
+    close) the start comes out after the end; see has_sessions.
+    """
+    start = session_on_or_after(from_date)
+    end = session_on_or_before(to_date)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+
+def has_sessions(from_date, to_date):
+    """Whether a session_range contains any session at all."""
+    return from_date <= to_date
@@ -0,0 +1,737 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+from alerts import recent_alerts, run_alerts
+from fetch_quota import QuotaExhausted
+from downsample import value_line
+from leaderboard import evaluate, universe
+from live_quotes import LIVE_INTERVAL, live_board, refresh_board
+from render_cache import memoize_artifact
+from risk_metrics import RISK_FORMAT, risk_metrics
+from rolling_stats import advance_rolling_state
+from tracker_data import load_dataset
+from tracker_stats import CI_FORMAT, METHODS, METHOD_LABELS, bootstrap_cohorts
+
+# plotly and pyarrow are imported inside the builders that need them, so a
+# cold start doesn't pay for them before the first chart or export
+
+# === Shared pieces ===
+def load_portfolio_dataset(p, today):
+    return load_dataset(p.tickers, p.benchmark, p.purchase_date, today)
+
+
+def get_risk_metrics(dataset, p):
+    return memoize_artifact(
+        "risk_metrics", dataset.version,
+        lambda cohorts, benchmark: risk_metrics(dataset.prices, benchmark, cohorts),
+        cohorts=p.cohort_map, benchmark=p.benchmark,
+    )
+
+
+def build_rolling_table(dataset, p, rows):
+    rolling = advance_rolling_state(p.key, dataset.prices, p.cohort_map, p.benchmark)
+    return rolling.snapshot().reindex(rows).style.format("{:.2f}%")
+
+
+def build_interval_table(dataset, p, method, n_resamples=10000):
+    ci_df = bootstrap_cohorts(dataset.prices, p.cohort_map, p.benchmark, method, n_resamples)
+    return ci_df.style.format(CI_FORMAT)
+
+
+# Each section below is a fragment: its widgets rerun only that section
+@st.fragment
+def rolling_section(dataset, p, rows, heading):
+    heading(f"🔁 Rolling Returns, Volatility and Excess vs {p.benchmark}")
+    st.dataframe(memoize_artifact(
+        "rolling_table", dataset.version, partial(build_rolling_table, dataset),
+        p=p, rows=rows,
+    ))
+
+
+@st.fragment
+def interval_section(dataset, p, heading):
+    heading(f"🎲 Excess Return vs {p.benchmark} (95% Bootstrap Intervals)")
+    ci_method = st.radio("Resample", METHODS, format_func=METHOD_LABELS.get, horizontal=True)
+    st.dataframe(memoize_artifact(
+        "interval_table", dataset.version, partial(build_interval_table, dataset),
+        p=p, method=ci_method,
+    ), hide_index=True)
+
+
+# Live quotes: only the latest row is patched, so each tick redraws this
+# section alone and leaves every history-based artifact above it untouched
+def live_panel(dataset, p):
+    import plotly.graph_objects as go
+
+    board = live_board(dataset)
+    try:
+        refresh_board(board, st.secrets["FMP_API_KEY"], st.session_state.get("live_interval", LIVE_INTERVAL))
+    except (requests.RequestException, QuotaExhausted) as e:
+        st.warning(f"Live quotes unavailable: {e}")
+
+    cohorts = p.cohort_map
+    cohort_live = board.cohort_returns(cohorts)
+    cohort_moves = cohort_live - board.cohort_returns(cohorts, board.close)
+    day = board.day_change()
+
+    st.markdown(f"### ⚡ Live Returns (as of {board.as_of:%Y-%m-%d %H:%M:%S %Z})")
+    cols = st.columns(len(cohorts) + 1)
+    for col, label in zip(cols, cohorts):
+        col.metric(label, f"{cohort_live[label]:.2f}%", f"{cohort_moves[label]:+.2f} pts today")
+    bench = board.returns().get(p.benchmark)
+    if bench is not None:
+        cols[-1].metric(f"📈 {p.benchmark}", f"{bench:.2f}%", f"{day[p.benchmark]:+.2f}% today")
+
+    ticks = board.tick_frame(cohorts, p.benchmark)
+    if len(ticks) > 1:
+        fig = go.Figure([
+            go.Scatter(x=ticks.index, y=ticks[c], mode="lines", name=c)
+            for c in ticks.columns
+        ])
+        fig.update_layout(template="plotly_dark", yaxis_title="Return (%)", height=300, margin=dict(t=20))
+        st.plotly_chart(fig, use_container_width=True)
+
+    movers = pd.DataFrame({
+        "Price": pd.Series(board.latest, index=board.columns),
+        "Close": pd.Series(board.close, index=board.columns),
+        "Day (%)": day,
+    })
+    movers = movers.drop(p.benchmark, errors="ignore").sort_values("Day (%)", ascending=False)
+    st.dataframe(movers.style.format({"Price": "${:.2f}", "Close": "${:.2f}", "Day (%)": "{:+.2f}%"}))
+
+
+def live_section(dataset, p):
+    """Poll and redraw the live panel on its own timer when live quotes are on."""
+    if not st.session_state.get("live_quotes"):
+        return
+    st.fragment(run_every=st.session_state.get("live_interval", LIVE_INTERVAL))(live_panel)(dataset, p)
+
+
+def build_export(dataset, p, table, fmt, symbols, start, end):
+    from data_export import export_tables, filter_table, to_bytes
+
+    tables = memoize_artifact("export_tables", dataset.version, lambda p: export_tables(dataset, p.cohort_map), p=p)
+    return to_bytes(filter_table(tables[table], symbols, start, end), fmt)
+
+
+@st.fragment
+def export_section(dataset, p):
+    from data_export import FORMATS, MIME_TYPES, TABLES, write_exports
+
+    # Keep the on-disk snapshot current for notebooks (see data_export.read_export)
+    write_exports(p.key, dataset, p.cohort_map)
+    if dataset.prices.empty:
+        return
+    with st.expander("📦 Export data (Parquet / Arrow)"):
+        c1, c2 = st.columns(2)
+        table = c1.selectbox("Table", TABLES)
+        fmt = c2.radio("Format", list(FORMATS), horizontal=True)
+        symbols = st.multiselect("Symbols (all if empty)", list(dataset.prices.columns))
+        first_day, last_day = dataset.prices.index.min().date(), dataset.prices.index.max().date()
+        dates = st.date_input("Dates", (first_day, last_day), min_value=first_day, max_value=last_day)
+        start, end = (*dates, last_day)[:2]    # mid-selection the widget holds only the start
+        data = memoize_artifact(
+            "export_bytes", dataset.version, partial(build_export, dataset),
+            p=p, table=table, fmt=fmt, symbols=symbols, start=start, end=end,
+        )
+        st.download_button(
+            f"⬇️ {table}{FORMATS[fmt]}", data,
+            file_name=f"{p.key}_{table}{FORMATS[fmt]}", mime=MIME_TYPES[fmt],
+        )
+
+
+def markdown_heading(text):
+    st.markdown(f"### {text}")
+
+
+def show_pending(dataset):
+    if dataset.pending:
+        st.warning(
+            f"⏳ Waiting for FMP quota ({len(dataset.pending)} pending, loaded on a later refresh): "
+            f"{', '.join(dataset.pending)}"
+        )
+    if dataset.stale:
+        st.info(
+            f"🕒 Stored prices, newest sessions waiting for FMP quota ({len(dataset.stale)}): "
+            f"{', '.join(dataset.stale)}"
+        )
+
+
+def has_prices(dataset):
+    """False, with a note, while nothing has loaded (e.g. every symbol is waiting for quota); the page stops there."""
+    if not dataset.has_sessions:
+        st.info(f"No trading session has closed since {dataset.from_date} yet; prices appear after the first close.")
+        return False
+    if dataset.prices.empty:
+        st.info("No prices loaded yet; this page fills in once they are.")
+        return False
+    return True
+
+
+def show_failures(dataset):
+    errors = dataset.failed_symbols
+    if errors:
+        st.error(f"❌ Failed tickers: {', '.join(errors)}")
+    elif not (dataset.pending or dataset.stale or dataset.prices.empty):
+        st.success("✅ All price data loaded")
+    show_pending(dataset)
+
+
+# === Basic layout: bar chart beside a returns table ===
+def build_basic_frame(dataset, p):
+    returns = dataset.returns.drop(p.benchmark, errors="ignore")
+    valid_returns = list(returns.values)
+    portfolio_return = sum(valid_returns) / len(valid_returns) if valid_returns else None
+
+    data = {**returns.to_dict(), "Portfolio": portfolio_return, p.benchmark: dataset.returns.get(p.benchmark)}
+    df = pd.DataFrame.from_dict(data, orient="index", columns=["Return (%)"]).dropna()
+    return df.loc[[t for t in p.tickers if t in df.index] + [r for r in ("Portfolio", p.benchmark) if r in df.index]]
+
+
+def build_basic_chart(dataset, p):
+    import plotly.graph_objects as go
+
+    df = memoize_artifact("basic_frame", dataset.version, partial(build_basic_frame, dataset), p=p)
+
+    # === Prepare chart inputs ===
+    bar_labels = [i for i in df.index]
+    bar_returns = df["Return (%)"].tolist()
+    bar_colors = ["#97E956" if val > 0 else "#F44A46" for val in bar_returns]
+
+    # Portfolio and benchmark coloring
+    if "Portfolio" in bar_labels:
+        bar_colors[bar_labels.index("Portfolio")] = "#057DC9"
+    if p.benchmark in bar_labels:
+        bar_colors[bar_labels.index(p.benchmark)] = "orange"
+
+    # === Build Plotly chart ===
+    fig = go.Figure(
+        data=[go.Bar(
+            x=bar_labels,
+            y=bar_returns,
+            marker_color=bar_colors,
+            text=[f"{r:.1f}%" for r in bar_returns],
+            textposition="outside"
+        )]
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        title=p.chart_title.format(purchase_date=p.purchase_date),
+        yaxis_title="Return (%)",
+        xaxis_title="",
+        showlegend=False,
+        height=500,
+        width=700
+    )
+
+    # Optional separator line
+    sep_index = len(p.tickers) - 0.5
+    fig.add_shape(
+        type="line",
+        x0=sep_index, x1=sep_index,
+        y0=min(bar_returns) * 1.1,
+        y1=max(bar_returns) * 1.1,
+        line=dict(color="white", width=1, dash="dot")
+    )
+
+    fig.update_yaxes(showgrid=True, zeroline=True, zerolinewidth=1, zerolinecolor='gray')
+    return fig
+
+
+def build_basic_table(dataset, p):
+    df = memoize_artifact("basic_frame", dataset.version, partial(build_basic_frame, dataset), p=p)
+    table = df.join(get_risk_metrics(dataset, p))
+    table = table.rename(index={"Portfolio": "📦 Portfolio", p.benchmark: f"📈 {p.benchmark}"})
+
+    def highlight_special_rows(row):
+        if row.name == "📦 Portfolio":
+            return ["color: #057DC9; font-weight: bold"] * len(row)
+        elif row.name == f"📈 {p.benchmark}":
+            return ["color: orange; font-weight: bold"] * len(row)
+        else:
+            return [""] * len(row)
+
+    return (
+        table.style
+        .format({"Return (%)": "{:.2f}%", **RISK_FORMAT})
+        .apply(highlight_special_rows, axis=1)
+    )
+
+
+@st.fragment
+def basic_returns_section(dataset, p):
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fig = memoize_artifact("basic_chart", dataset.version, partial(build_basic_chart, dataset), p=p)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.dataframe(memoize_artifact("basic_table", dataset.version, partial(build_basic_table, dataset), p=p))
+
+
+def render_basic(p):
+    today = p.to_date()
+    st.title(p.title)
+    st.markdown(p.subtitle.format(purchase_date=p.purchase_date, today=today))
+
+    dataset = load_portfolio_dataset(p, today)
+    show_failures(dataset)
+    if not has_prices(dataset):
+        return
+
+    live_section(dataset, p)
+    basic_returns_section(dataset, p)
+    rows = list(p.cohort_map) + [p.benchmark] + list(p.tickers)
+    rolling_section(dataset, p, rows, markdown_heading)
+    interval_section(dataset, p, markdown_heading)
+    export_section(dataset, p)
+
+
+# === Ranked layout: leaders and cohorts vs benchmark, full ranked table ===
+def cohort_returns(dataset, p):
+    returns = dataset.returns.drop(p.benchmark, errors="ignore")
+
+    def portfolio_return(symbols):
+        vals = [returns[s] for s in symbols if s in returns]
+        return sum(vals) / len(vals) if vals else None
+
+    return {label: portfolio_return(symbols) for label, symbols in p.cohort_map.items()}
+
+
+def build_ranked_chart(dataset, p):
+    import plotly.graph_objects as go
+
+    returns = dataset.returns
+    leaders = list(p.cohort_map.values())[0]
+    cohort_values = list(cohort_returns(dataset, p).values())
+
+    bar_labels = leaders + [c.chart_label or c.label for c in p.cohorts] + [f"📈 {p.benchmark}"]
+    bar_returns = [returns.get(t, 0) for t in leaders] + cohort_values + [returns.get(p.benchmark)]
+    bar_colors = (
+        ["#97E956" if r > 0 else "#F44A46" for r in bar_returns[:len(leaders)]] +
+        [c.color for c in p.cohorts] + ["orange"]
+    )
+
+    fig = go.Figure(
+        data=[go.Bar(
+            x=bar_labels,
+            y=bar_returns,
+            marker_color=bar_colors,
+            text=[f"{r:.1f}%" if r is not None else "N/A" for r in bar_returns],
+            textposition="outside"
+        )]
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        title=p.chart_title.format(purchase_date=p.purchase_date),
+        yaxis_title="Return (%)",
+        xaxis_title="",
+        showlegend=False,
+        height=550
+    )
+    return fig
+
+
+def ranked_frame(returns, p):
+    """Return, cohort label and prediction rank per symbol, before the risk columns."""
+    returns = returns.drop(p.benchmark, errors="ignore")
+    df = returns.to_frame("Return (%)")
+    df.index.name = "Symbol"
+    df = df.reset_index()
+
+    # Add Portfolio Label: the smallest cohort holding the ticker
+    cohorts = p.cohort_map
+    last_label = list(cohorts)[-1]
+
+    def get_portfolio_label(ticker):
+        for label, symbols in cohorts.items():
+            if ticker in symbols:
+                return label
+        return last_label
+
+    df["Portfolio"] = df["Symbol"].apply(get_portfolio_label)
+
+    # Add Predicted Rank
+    tickers = list(p.tickers)
+    df["Prediction Rank"] = df["Symbol"].apply(lambda s: tickers.index(s) + 1 if s in tickers else None)
+
+    # Reorder columns: Prediction Rank first
+    cols = ["Prediction Rank"] + [col for col in df.columns if col != "Prediction Rank"]
+    return df[cols]
+
+
+def build_ranked_table(dataset, p):
+    # Add risk columns
+    df = ranked_frame(dataset.returns, p).join(get_risk_metrics(dataset, p), on="Symbol")
+
+    # Sort by return (or keep original order)
+    df = df.sort_values("Return (%)", ascending=False)
+
+    return (
+        df.style
+            .format({"Return (%)": "{:.2f}%", **RISK_FORMAT})
+            .background_gradient(subset=["Return (%)"], cmap="Greens")
+    )
+
+
+@st.fragment
+def ranked_chart_section(dataset, p):
+    fig = memoize_artifact("ranked_chart", dataset.version, partial(build_ranked_chart, dataset), p=p)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def ranked_table_section(dataset, p):
+    st.markdown(p.table_title)
+    st.dataframe(
+        memoize_artifact("ranked_table", dataset.version, partial(build_ranked_table, dataset), p=p),
+        hide_index=True,
+    )
+
+
+@st.fragment
+def cohort_risk_section(dataset, p):
+    st.markdown(f"### 🛡️ Cohort Risk vs {p.benchmark}")
+    st.dataframe(memoize_artifact(
+        "cohort_risk_table", dataset.version,
+        lambda p: get_risk_metrics(dataset, p).reindex(list(p.cohort_map) + [p.benchmark]).style.format(RISK_FORMAT),
+        p=p,
+    ))
+
+
+def render_ranked(p):
+    today = p.to_date()
+    st.title(p.title)
+    st.markdown(p.subtitle.format(purchase_date=p.purchase_date, today=today))
+
+    dataset = load_portfolio_dataset(p, today)
+    show_failures(dataset)
+    if not has_prices(dataset):
+        return
+
+    live_section(dataset, p)
+    ranked_chart_section(dataset, p)
+    ranked_table_section(dataset, p)
+    cohort_risk_section(dataset, p)
+    rows = list(p.cohort_map) + [p.benchmark] + list(p.tickers)
+    rolling_section(dataset, p, rows, markdown_heading)
+    interval_section(dataset, p, markdown_heading)
+    export_section(dataset, p)
+
+
+# === Value layout: fixed $ per stock, value over time vs benchmark ===
+def value_stock_data(dataset, p):
+    symbols = [p.benchmark, *p.tickers]
+    return memoize_artifact(
+        "stock_data", dataset.version,
+        lambda symbols: {sym: dataset.series(sym).to_frame("close") for sym in symbols if sym in dataset.prices},
+        symbols=symbols,
+    )
+
+
+# Calculate returns for a fixed investment per stock
+def calculate_returns(data, invest, benchmark):
+    rtns = {}
+    portfolio_value = 0
+    for sym, df in data.items():
+        if df.empty:
+            continue
+        # oldest price = first row; latest = last row
+        start_price = df["close"].iloc[0]
+        end_price   = df["close"].iloc[-1]
+        pct = (end_price - start_price) / start_price * 100
+        final = invest * end_price / start_price
+        rtns[sym] = {"return_pct": pct, "final_value": final}
+        if sym != benchmark:
+            portfolio_value += final
+    return rtns, portfolio_value
+
+
+def value_summary(dataset, p):
+    returns, port_val = calculate_returns(value_stock_data(dataset, p), p.investment, p.benchmark)
+    init_inv = p.investment * len(p.tickers)
+    port_pct = (port_val - init_inv) / init_inv * 100
+    return returns, port_val, init_inv, port_pct
+
+
+def build_value_bar_chart(dataset, p):
+    import plotly.express as px
+
+    returns, _, _, port_pct = value_summary(dataset, p)
+
+    bar_rows = []
+    for sym, info in returns.items():
+        bar_rows.append({"Symbol": sym, "Return": info["return_pct"]})
+    bar_rows.append({"Symbol": "Portfolio", "Return": port_pct})
+    bar_df = pd.DataFrame(bar_rows)
+
+    # build a color list per row
+    colors = np.select(
+        [bar_df["Symbol"] == "Portfolio", bar_df["Symbol"] == p.benchmark, bar_df["Return"] >= 0],
+        ["#057DC9", "#FFA500", "#97E956"],
+        default="#F44A46",
+    )
+
+    fig_bar = px.bar(
+        bar_df,
+        x="Symbol",
+        y="Return",
+        title=p.chart_title.format(investment=f"{p.investment:g}"),
+        text=bar_df["Return"].round(2).map(lambda x: f"{x:.2f}%"),
+    )
+    # add a horizontal dashed line at the benchmark's return
+    bench = bar_df.loc[bar_df["Symbol"] == p.benchmark, "Return"]
+    if not bench.empty:
+        fig_bar.add_hline(
+            y=bench.iloc[0],
+            line_dash="dot",
+            line_width=1,
+            line_color="white",
+            annotation_text="",
+            annotation_position="top right"
+        )
+    fig_bar.update_traces(marker_color=list(colors), textposition="auto")
+    fig_bar.update_layout(showlegend=False, yaxis_title="Return (%)")
+    return fig_bar
+
+
+def value_frame(stock_data, p):
+    """Daily $ value of each holding, the portfolio and the benchmark from per-symbol closes."""
+    # Build a DataFrame of daily values
+    port_df = pd.DataFrame()
+    for sym in p.tickers:
+        df = stock_data.get(sym)
+        if df is None or df.empty:
+            continue
+        # buy at start_price
+        start_price = df["close"].iloc[0]
+        shares = p.investment / start_price
+        port_df[sym] = df["close"] * shares
+
+    # sum up
+    port_df["Portfolio"] = port_df.sum(axis=1)
+
+    # add the benchmark with the same total capital as the portfolio
+    bench_df = stock_data.get(p.benchmark)
+    if bench_df is not None and not bench_df.empty:
+        initial_investment = p.investment * len(p.tickers)
+        bench_shares = initial_investment / bench_df["close"].iloc[0]
+        port_df[p.benchmark] = bench_df["close"] * bench_shares
+
+    port_df.index.name = "Date"
+    return port_df
+
+
+def build_value_frame(dataset, p):
+    return value_frame(value_stock_data(dataset, p), p)
+
+
+def build_value_line_chart(dataset, p, start, end, show_stocks):
+    import plotly.graph_objects as go
+
+    port_df = memoize_artifact("value_frame", dataset.version, partial(build_value_frame, dataset), p=p)
+    window = port_df.loc[str(start):str(end)]
+
+    fig_line = go.Figure()
+    if show_stocks:
+        for sym in p.tickers:
+            if sym in window:
+                fig_line.add_trace(value_line(
+                    window[sym],
+                    name=sym,
+                    line=dict(width=1),
+                    opacity=0.5,
+                    hovertemplate=f"Date: %{{x}}<br>{sym}: $%{{y:.2f}}",
+                ))
+    fig_line.add_trace(value_line(
+        window["Portfolio"],
+        name="Portfolio",
+        line=dict(color="#057DC9"),
+        hovertemplate="Date: %{x}<br>Portfolio: $%{y:.2f}",
+    ))
+    if p.benchmark in window:
+        fig_line.add_trace(value_line(
+            window[p.benchmark],
+            name=p.benchmark,
+            line=dict(color="#FFA500"),
+            hovertemplate=f"Date: %{{x}}<br>{p.benchmark}: $%{{y:.2f}}",
+        ))
+
+    fig_line.update_layout(
+        title=f"Portfolio vs {p.benchmark} Value Over Time",
+        xaxis_title="Date",
+        yaxis_title="Value ($)",
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig_line
+
+
+@st.fragment
+def value_bar_section(dataset, p):
+    fig = memoize_artifact("value_bar_chart", dataset.version, partial(build_value_bar_chart, dataset), p=p)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def value_line_section(dataset, p):
+    port_df = memoize_artifact("value_frame", dataset.version, partial(build_value_frame, dataset), p=p)
+    if port_df.empty:
+        return
+
+    # Narrowing the range rebuilds the chart from full-resolution data, so a
+    # zoomed-in window shows every point while the full history stays downsampled
+    first_day, last_day = port_df.index.min().date(), port_df.index.max().date()
+    if first_day < last_day:
+        zoom_start, zoom_end = st.slider("Date range", first_day, last_day, (first_day, last_day))
+    else:
+        zoom_start, zoom_end = first_day, last_day
+    show_stocks = st.checkbox("Show individual stocks")
+
+    fig_line = memoize_artifact(
+        "value_line_chart", dataset.version, partial(build_value_line_chart, dataset),
+        p=p, start=zoom_start, end=zoom_end, show_stocks=show_stocks,
+    )
+    st.plotly_chart(fig_line, use_container_width=True)
+
+
+@st.fragment
+def value_risk_section(dataset, p):
+    st.subheader("Risk")
+    st.dataframe(memoize_artifact(
+        "value_risk_table", dataset.version,
+        lambda p: get_risk_metrics(dataset, p).reindex(["Portfolio", p.benchmark, *p.tickers]).style.format(RISK_FORMAT),
+        p=p,
+    ))
+
+
+def render_value(p):
+    today = p.to_date()
+    st.title(p.title)
+    # The screen's description (if any) above the tracking window, as the standalone pages had them
+    for text in filter(None, [p.description, p.subtitle.format(purchase_date=p.purchase_date, today=today)]):
+        st.markdown(
+            f"<p style='font-size:16px; color:#aaaaaa;'>{text}</p>",
+            unsafe_allow_html=True
+        )
+
+    dataset = load_portfolio_dataset(p, today)
+    for sym, reason in dataset.failed:
+        if reason == "no data":
+            st.warning(f"No data for {sym}")
+        else:
+            st.error(f"Error fetching {sym}: {reason}")
+    show_pending(dataset)
+    if not has_prices(dataset):
+        return
+
+    live_section(dataset, p)
+    value_bar_section(dataset, p)
+    value_line_section(dataset, p)
+
+    # --- Summary metrics ---
+    _, port_val, init_inv, port_pct = value_summary(dataset, p)
+    st.subheader("Summary")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Initial Investment", f"${init_inv:.2f}")
+    c2.metric("Final Portfolio Value", f"${port_val:.2f}")
+    c3.metric("Portfolio Return", f"{port_pct:.2f}%")
+
+    value_risk_section(dataset, p)
+    rows = ["Portfolio", p.benchmark, *p.tickers]
+    rolling_section(dataset, p, rows, st.subheader)
+    interval_section(dataset, p, st.subheader)
+    export_section(dataset, p)
+
+
+# === Leaderboard: every portfolio and cohort from one shared price matrix ===
+def build_leaderboard(dataset, portfolios):
+    return evaluate(dataset.prices, portfolios)
+
+
+def build_leaderboard_chart(dataset, portfolios, names, benchmark):
+    import plotly.graph_objects as go
+
+    curves, table = memoize_artifact(
+        "leaderboard", dataset.version, partial(build_leaderboard, dataset), portfolios=portfolios,
+    )
+
+    fig = go.Figure()
+    for name in names:
+        fig.add_trace(value_line(
+            curves[name],
+            name=name,
+            hovertemplate=f"Date: %{{x}}<br>{name}: %{{y:.2f}}",
+        ))
+    bench = dataset.series(benchmark)
+    if not bench.empty:
+        fig.add_trace(value_line(
+            bench / bench.iloc[0] * 100,
+            name=benchmark,
+            line=dict(color="#FFA500", dash="dot"),
+            hovertemplate=f"Date: %{{x}}<br>{benchmark}: %{{y:.2f}}",
+        ))
+    fig.update_layout(
+        title="Value Over Time (100 = purchase date)",
+        xaxis_title="Date",
+        yaxis_title="Value",
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+@st.fragment
+def leaderboard_chart_section(dataset, portfolios, names):
+    shown = st.multiselect("Portfolios", names, default=names)
+    fig = memoize_artifact(
+        "leaderboard_chart", dataset.version, partial(build_leaderboard_chart, dataset),
+        portfolios=portfolios, names=shown, benchmark=portfolios[0].benchmark,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_leaderboard(portfolios):
+    portfolios = tuple(portfolios)
+    symbols, start, end = universe(portfolios)
+    st.title("🏆 Portfolio Leaderboard")
+    st.markdown(f"Every portfolio and cohort against its benchmark, from **{start}** to **{end}**")
+
+    # One dataset over the union of all symbols: each symbol is fetched once
+    dataset = load_dataset(tuple(symbols), portfolios[0].benchmark, start, end)
+    show_failures(dataset)
+    if not has_prices(dataset):
+        return
+
+    curves, table = memoize_artifact(
+        "leaderboard", dataset.version, partial(build_leaderboard, dataset), portfolios=portfolios,
+    )
+    st.dataframe(memoize_artifact(
+        "leaderboard_table", dataset.version,
+        lambda portfolios: table.style
+            .format({"Return (%)": "{:+.2f}%", "Benchmark Return (%)": "{:+.2f}%", "Excess (%)": "{:+.2f}%"})
+            .background_gradient(subset=["Excess (%)"], cmap="RdYlGn"),
+        portfolios=portfolios,
+    ))
+    leaderboard_chart_section(dataset, portfolios, list(curves.columns))
+
+    # A fresh dataset is a data refresh: evaluate every portfolio's alert rules on it
+    run_alerts(dataset, portfolios)
+    alerts = recent_alerts()
+    with st.expander(f"🔔 Recent alerts ({len(alerts)})"):
+        for alert in alerts:
+            detail = (
+                ", ".join(f"{sym} {v:+.1f}%" for sym, v in alert["symbols"].items())
+                if "symbols" in alert else f"{alert['value']:+.2f}"
+            )
+            st.markdown(f"**{alert['session']}** · {alert['portfolio']} · {alert['cohort']} — {alert['rule']}: {detail}")
+
+
+RENDERERS = {"basic": render_basic, "ranked": render_ranked, "value": render_value}
+
+
+def render_portfolio(p):
+    RENDERERS[p.layout](p)